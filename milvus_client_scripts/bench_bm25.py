@@ -0,0 +1,235 @@
+"""
+BM25 full-text search benchmark, building on the BM25 schema of insert_count.py.
+
+1. Generates a synthetic corpus: pseudo-words "w<rank>" drawn from a Zipf
+   distribution over --vocab terms, log-normal document lengths. Queries are
+   2-5 terms from the mid-frequency band (the head is mostly "stop words").
+2. Ingests it through the insert pipeline into two collections with the same
+   fields (id, text, a dim-2 vector), one with the BM25 function producing a
+   sparse field, to measure the function's insert overhead.
+3. For every (inverted_index_algo, bm25_k1, bm25_b) combination rebuilds the
+   SPARSE_INVERTED_INDEX, then measures text-search QPS/latency and recall@k
+   against a local BM25 reference computed with NumPy using the same k1/b.
+
+Usage:
+  python bench_bm25.py
+  python bench_bm25.py --docs 500000 --algos DAAT_MAXSCORE,DAAT_WAND --k1 1.2,1.5 --b 0.5,0.75 --concurrency 8
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymilvus import (
+    connections,
+    FieldSchema, CollectionSchema, DataType, Function, FunctionType,
+    Collection,
+    utility,
+)
+
+from bench_util import LatencyStats, print_table, write_csv
+from ground_truth import recall_at_k
+from pipelined_insert import PipelinedInserter
+
+uri = "http://localhost:19530"
+collection_name = "bench_bm25"
+baseline_collection_name = "bench_bm25_plain"
+INDEX_ALGOS = ("DAAT_MAXSCORE", "DAAT_WAND", "TAAT_NAIVE")
+dim = 2
+batch = 5000
+
+
+class Corpus:
+    """Zipf-distributed synthetic documents, kept as token-rank arrays."""
+
+    def __init__(self, num_docs, vocab, zipf_s=1.1, mean_len=60, seed=0):
+        rng = np.random.default_rng(seed)
+        probs = 1.0 / np.arange(1, vocab + 1) ** zipf_s
+        self.probs = probs / probs.sum()
+        lengths = np.maximum(1, rng.lognormal(np.log(mean_len), 0.5, num_docs).astype(np.int64))
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.tokens = rng.choice(vocab, size=int(self.offsets[-1]), p=self.probs)
+        self.num_docs = num_docs
+        self.vocab = vocab
+        self.words = np.array([f"w{r}" for r in range(vocab)])
+
+    def text(self, doc):
+        return " ".join(self.words[self.tokens[self.offsets[doc]:self.offsets[doc + 1]]])
+
+    def queries(self, num, seed=1):
+        """Term-rank lists of 2-5 terms, sampled by frequency from outside the top 1%."""
+        rng = np.random.default_rng(seed)
+        head = max(1, self.vocab // 100)
+        p = self.probs[head:] / self.probs[head:].sum()
+        return [head + rng.choice(self.vocab - head, size=int(rng.integers(2, 6)), replace=False, p=p)
+                for _ in range(num)]
+
+
+class LocalBM25:
+    """Exact BM25 with Milvus' formula: idf = ln(1 + (N - df + 0.5) / (df + 0.5))."""
+
+    def __init__(self, corpus):
+        doc_of_token = np.repeat(np.arange(corpus.num_docs), np.diff(corpus.offsets))
+        keys, tf = np.unique(corpus.tokens * corpus.num_docs + doc_of_token, return_counts=True)
+        # keys are sorted by term, then doc: one contiguous posting list per term.
+        self.post_docs = keys % corpus.num_docs
+        self.post_tf = tf.astype(np.float64)
+        self.starts = np.searchsorted(keys // corpus.num_docs, np.arange(corpus.vocab + 1))
+        self.doc_len = np.diff(corpus.offsets).astype(np.float64)
+        self.num_docs = corpus.num_docs
+
+    def topk(self, terms, k, k1, b):
+        norm = k1 * (1 - b + b * self.doc_len / self.doc_len.mean())
+        scores = np.zeros(self.num_docs)
+        for t in set(terms.tolist()):
+            s, e = self.starts[t], self.starts[t + 1]
+            docs, tf = self.post_docs[s:e], self.post_tf[s:e]
+            idf = np.log(1 + (self.num_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tf * (k1 + 1) / (tf + norm[docs])
+        k = min(k, int((scores > 0).sum()))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        return top[np.argsort(-scores[top])]
+
+
+def create_collections():
+    text_fields = [
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=False),
+        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535, enable_analyzer=True),
+        FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
+    ]
+    bm25_function = Function(
+        name="text_bm25_emb",
+        input_field_names=["text"],
+        output_field_names=["sparse"],
+        function_type=FunctionType.BM25,
+    )
+    schemas = {
+        collection_name: CollectionSchema(
+            text_fields + [FieldSchema(name="sparse", dtype=DataType.SPARSE_FLOAT_VECTOR)],
+            functions=[bm25_function]),
+        baseline_collection_name: CollectionSchema(text_fields),
+    }
+    for name, schema in schemas.items():
+        utility.drop_collection(name)
+        collection = Collection(name, schema)
+        collection.create_index("vector", {"index_type": "FLAT", "metric_type": "L2", "params": {}},
+                                index_name="vector")
+
+
+def ingest(corpus, concurrency):
+    """Insert the corpus into both collections. Returns one summary row per collection."""
+    def gen_batch(i):
+        docs = range(i * batch, min((i + 1) * batch, corpus.num_docs))
+        return [
+            np.arange(docs.start, docs.stop, dtype=np.int64),
+            [corpus.text(d) for d in docs],
+            np.zeros((len(docs), dim), dtype=np.float32),
+        ]
+
+    num_batches = -(-corpus.num_docs // batch)
+    report = []
+    for name in (baseline_collection_name, collection_name):
+        summary = PipelinedInserter(uri, name, concurrency=concurrency, progress_every=0).run(gen_batch, num_batches)
+        Collection(name).flush()
+        report.append({"collection": name, "rows_per_s": summary["rows_per_s"], "p50_ms": summary["p50_ms"],
+                       "p99_ms": summary["p99_ms"], "gen_ms_avg": summary["gen_ms_avg"]})
+    # Relative insert slowdown vs. the plain collection; print_table takes its columns from the first row.
+    report[0]["bm25_overhead"] = 0.0
+    report[1]["bm25_overhead"] = report[0]["rows_per_s"] / report[1]["rows_per_s"] - 1
+    return report
+
+
+def rebuild_sparse_index(collection, algo, k1, b):
+    collection.release()
+    if collection.has_index(index_name="sparse"):
+        collection.drop_index(index_name="sparse")
+    start = time.perf_counter()
+    collection.create_index("sparse", {
+        "index_type": "SPARSE_INVERTED_INDEX",
+        "metric_type": "BM25",
+        "params": {"inverted_index_algo": algo, "bm25_k1": k1, "bm25_b": b},
+    }, index_name="sparse")
+    utility.wait_for_index_building_complete(collection.name, index_name="sparse")
+    collection.load()
+    return time.perf_counter() - start
+
+
+def search_config(collection, corpus, reference, queries, topk, concurrency, k1, b):
+    texts = [" ".join(corpus.words[q]) for q in queries]
+    truth = [reference.topk(q, topk, k1, b) for q in queries]
+    found = [None] * len(queries)
+    stats = LatencyStats()
+    param = {"metric_type": "BM25", "params": {}}
+
+    def run(i):
+        t0 = time.perf_counter()
+        try:
+            res = collection.search([texts[i]], anns_field="sparse", param=param, limit=topk)
+        except Exception as e:
+            stats.error()
+            print(f"search failed: {e}")
+            return
+        stats.record(time.perf_counter() - t0, 1)
+        found[i] = [hit.id for hit in res[0]]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(len(queries))))
+    summary = stats.summary(time.perf_counter() - start)
+    ok = [i for i, f in enumerate(found) if f is not None]
+    summary["recall"] = recall_at_k([found[i] for i in ok], [truth[i].tolist() for i in ok], topk)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--mean-len", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--topk", type=int, default=10)
+    parser.add_argument("--algos", default=",".join(INDEX_ALGOS))
+    parser.add_argument("--k1", default="1.2")
+    parser.add_argument("--b", default="0.75")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--csv", default=None, help="append search results to this CSV file")
+    args = parser.parse_args()
+
+    connections.connect("default", uri=uri)
+    print(utility.get_server_version())
+
+    start = time.perf_counter()
+    corpus = Corpus(args.docs, args.vocab, mean_len=args.mean_len)
+    reference = LocalBM25(corpus)
+    queries = corpus.queries(args.queries)
+    print(f"corpus: {args.docs} docs, {len(corpus.tokens)} tokens, generated in {time.perf_counter() - start:.1f}s")
+
+    create_collections()
+    print("\n========== INSERT THROUGHPUT ==========")
+    print_table(ingest(corpus, args.concurrency))
+
+    collection = Collection(collection_name)
+    results = []
+    for algo, k1, b in itertools.product(args.algos.split(","),
+                                         [float(v) for v in args.k1.split(",")],
+                                         [float(v) for v in args.b.split(",")]):
+        index_s = rebuild_sparse_index(collection, algo, k1, b)
+        s = search_config(collection, corpus, reference, queries, args.topk, args.concurrency, k1, b)
+        results.append({"algo": algo, "k1": k1, "b": b, "index_load_s": index_s, "qps": s["qps"],
+                        "p50_ms": s["p50_ms"], "p95_ms": s["p95_ms"], "p99_ms": s["p99_ms"],
+                        "recall": s["recall"], "errors": s["errors"]})
+        print(f"  {algo} k1={k1} b={b}: {s['qps']:.0f} qps, recall@{args.topk}={s['recall']:.3f}")
+
+    print(f"\n========== BM25 SEARCH (topk={args.topk}, concurrency={args.concurrency}) ==========")
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+    for name in (collection_name, baseline_collection_name):
+        utility.drop_collection(name)
+
+
+if __name__ == "__main__":
+    main()
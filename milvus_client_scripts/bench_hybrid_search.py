@@ -0,0 +1,219 @@
+"""
+Hybrid dense + sparse search benchmark.
+
+Loads the bench_bm25 synthetic corpus into a collection with a dense HNSW
+vector and a BM25 sparse field (the two fields of insert_count.py's schema),
+then for every nq x topk combination measures QPS and latency of:
+  - hybrid_rrf / hybrid_weighted: one hybrid_search with RRFRanker / WeightedRanker
+  - client_rrf / client_weighted: separate dense and sparse searches (issued in
+    parallel) merged client-side with the same ranker math
+  - dense / sparse: each single search alone, for reference
+Client-side merges also report agreement@topk with the server's hybrid results.
+
+Usage:
+  python bench_hybrid_search.py
+  python bench_hybrid_search.py --docs 200000 --nq 1,10 --topk 10,100 --concurrency 8
+"""
+
+import argparse
+import itertools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymilvus import (
+    connections,
+    FieldSchema, CollectionSchema, DataType, Function, FunctionType,
+    Collection, AnnSearchRequest, RRFRanker, WeightedRanker,
+    utility,
+)
+
+from bench_bm25 import Corpus
+from bench_util import LatencyStats, print_table, write_csv
+from ground_truth import recall_at_k
+from pipelined_insert import PipelinedInserter
+
+uri = "http://localhost:19530"
+collection_name = "bench_hybrid_search"
+dim = 128
+batch = 5000
+RRF_K = 60
+WEIGHTS = (0.5, 0.5)  # dense, sparse
+DENSE_PARAM = {"metric_type": "COSINE", "params": {"ef": 64}}
+SPARSE_PARAM = {"metric_type": "BM25", "params": {}}
+MODES = ("hybrid_rrf", "hybrid_weighted", "client_rrf", "client_weighted", "dense", "sparse")
+
+
+def prepare_collection(corpus, concurrency):
+    utility.drop_collection(collection_name)
+    fields = [
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=False),
+        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535, enable_analyzer=True),
+        FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
+        FieldSchema(name="sparse", dtype=DataType.SPARSE_FLOAT_VECTOR),
+    ]
+    bm25_function = Function(
+        name="text_bm25_emb",
+        input_field_names=["text"],
+        output_field_names=["sparse"],
+        function_type=FunctionType.BM25,
+    )
+    collection = Collection(collection_name, CollectionSchema(fields, functions=[bm25_function]))
+
+    def gen_batch(i):
+        docs = range(i * batch, min((i + 1) * batch, corpus.num_docs))
+        rng = np.random.default_rng(i)
+        return [
+            np.arange(docs.start, docs.stop, dtype=np.int64),
+            [corpus.text(d) for d in docs],
+            rng.random((len(docs), dim), dtype=np.float32),
+        ]
+
+    PipelinedInserter(uri, collection_name, concurrency=concurrency, progress_every=0).run(
+        gen_batch, -(-corpus.num_docs // batch))
+    collection.flush()
+    collection.create_index("vector", {"index_type": "HNSW", "metric_type": "COSINE",
+                                       "params": {"M": 16, "efConstruction": 200}}, index_name="vector")
+    collection.create_index("sparse", {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "BM25",
+                                       "params": {"inverted_index_algo": "DAAT_MAXSCORE"}}, index_name="sparse")
+    collection.load()
+    return collection
+
+
+def _normalize(score, metric):
+    """Score normalization used by Milvus' WeightedRanker."""
+    if metric == "COSINE":
+        return (1 + score) / 2
+    return 2 * math.atan(score) / math.pi  # IP, BM25
+
+
+def merge_rrf(dense_hits, sparse_hits, limit, k=RRF_K):
+    scores = {}
+    for hits in (dense_hits, sparse_hits):
+        for rank, hit in enumerate(hits):
+            scores[hit.id] = scores.get(hit.id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+
+def merge_weighted(dense_hits, sparse_hits, limit, weights=WEIGHTS):
+    scores = {}
+    for hits, weight, metric in ((dense_hits, weights[0], "COSINE"), (sparse_hits, weights[1], "BM25")):
+        for hit in hits:
+            scores[hit.id] = scores.get(hit.id, 0.0) + weight * _normalize(hit.distance, metric)
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+
+class HybridRunner:
+    def __init__(self, collection, topk):
+        self.collection = collection
+        self.topk = topk
+        self.side_pool = ThreadPoolExecutor(max_workers=64)
+
+    def _dense(self, vectors):
+        return self.collection.search(vectors, anns_field="vector", param=DENSE_PARAM, limit=self.topk)
+
+    def _sparse(self, texts):
+        return self.collection.search(texts, anns_field="sparse", param=SPARSE_PARAM, limit=self.topk)
+
+    def hybrid(self, vectors, texts, ranker):
+        reqs = [AnnSearchRequest(vectors, "vector", DENSE_PARAM, limit=self.topk),
+                AnnSearchRequest(texts, "sparse", SPARSE_PARAM, limit=self.topk)]
+        res = self.collection.hybrid_search(reqs, rerank=ranker, limit=self.topk)
+        return [[hit.id for hit in hits] for hits in res]
+
+    def client_merge(self, vectors, texts, merge):
+        dense = self.side_pool.submit(self._dense, vectors)
+        sparse = self._sparse(texts)
+        dense = dense.result()
+        return [merge(d, s, self.topk) for d, s in zip(dense, sparse)]
+
+    def run(self, mode, vectors, texts):
+        if mode == "hybrid_rrf":
+            return self.hybrid(vectors, texts, RRFRanker(RRF_K))
+        if mode == "hybrid_weighted":
+            return self.hybrid(vectors, texts, WeightedRanker(*WEIGHTS))
+        if mode == "client_rrf":
+            return self.client_merge(vectors, texts, merge_rrf)
+        if mode == "client_weighted":
+            return self.client_merge(vectors, texts, merge_weighted)
+        res = self._dense(vectors) if mode == "dense" else self._sparse(texts)
+        return [[hit.id for hit in hits] for hits in res]
+
+
+def bench_mode(runner, mode, requests, concurrency):
+    """Run every (vectors, texts) request; returns (summary, per-request id lists)."""
+    stats = LatencyStats()
+    results = [None] * len(requests)
+
+    def run(i):
+        vectors, texts = requests[i]
+        t0 = time.perf_counter()
+        try:
+            results[i] = runner.run(mode, vectors, texts)
+        except Exception as e:
+            stats.error()
+            print(f"{mode}: search failed: {e}")
+            return
+        stats.record(time.perf_counter() - t0, len(vectors))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(len(requests))))
+    return stats.summary(time.perf_counter() - start), results
+
+
+def _agreement(found, reference, topk):
+    pairs = [(f, r) for fs, rs in zip(found, reference) if fs and rs for f, r in zip(fs, rs)]
+    return recall_at_k([f for f, _ in pairs], [r for _, r in pairs], topk)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=200, help="search requests per configuration")
+    parser.add_argument("--nq", default="1,10")
+    parser.add_argument("--topk", default="10,100")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    connections.connect("default", uri=uri)
+    corpus = Corpus(args.docs, args.vocab)
+    collection = prepare_collection(corpus, args.concurrency)
+    rng = np.random.default_rng(7)
+    modes = args.modes.split(",")
+
+    results = []
+    for nq, topk in itertools.product([int(v) for v in args.nq.split(",")],
+                                      [int(v) for v in args.topk.split(",")]):
+        queries = corpus.queries(args.requests * nq)
+        requests = [(rng.random((nq, dim), dtype=np.float32).tolist(),
+                     [" ".join(corpus.words[q]) for q in queries[r * nq:(r + 1) * nq]])
+                    for r in range(args.requests)]
+        runner = HybridRunner(collection, topk)
+        found = {}
+        for mode in modes:
+            summary, found[mode] = bench_mode(runner, mode, requests, args.concurrency)
+            row = {"mode": mode, "nq": nq, "topk": topk, "qps": summary["qps"],
+                   "vectors_per_s": summary["rows_per_s"], "p50_ms": summary["p50_ms"],
+                   "p95_ms": summary["p95_ms"], "p99_ms": summary["p99_ms"], "errors": summary["errors"],
+                   "agreement": float("nan")}
+            server_mode = mode.replace("client_", "hybrid_")
+            if mode.startswith("client_") and server_mode in found:
+                row["agreement"] = _agreement(found[mode], found[server_mode], topk)
+            results.append(row)
+        runner.side_pool.shutdown()
+        print(f"  nq={nq} topk={topk} done")
+
+    utility.drop_collection(collection_name)
+    print(f"\n========== HYBRID SEARCH (concurrency={args.concurrency}) ==========")
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
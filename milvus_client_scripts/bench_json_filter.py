@@ -0,0 +1,167 @@
+"""
+JSON-field filter benchmark, based on the mixed-type "key_5" JSON column of insert_count.py.
+
+For each --string-ratios value a collection is loaded with documents
+  {"key_5": <int in [0, cardinality)> or "s<int>", "extra_0": ..., "extra_<n-1>": ...}
+where that fraction of key_5 values are strings and the rest ints. Count
+queries over json["key_5"] filters (int ==, int range, string ==, string in)
+are timed with no JSON index and with an INVERTED JSON path index on
+json["key_5"] for each --cast-types value, so the effect of type mixing on
+filter speed and on index usefulness is visible. Every count is checked
+against the expected count computed locally.
+
+Usage:
+  python bench_json_filter.py
+  python bench_json_filter.py --rows 1000000 --cardinality 100 --string-ratios 0,0.4,1 --cast-types double,varchar
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pymilvus import (
+    connections,
+    FieldSchema, CollectionSchema, DataType,
+    Collection,
+    utility,
+)
+
+from bench_util import percentiles, print_table, write_csv
+from pipelined_insert import PipelinedInserter
+
+uri = "http://localhost:19530"
+collection_name = "bench_json_filter"
+json_index_name = "json_key_5"
+json_path = 'json["key_5"]'
+dim = 2
+batch = 10000
+
+
+class JsonData:
+    """key_5 values kept as (is_str, value) arrays so filters can be evaluated locally."""
+
+    def __init__(self, rows, cardinality, string_ratio, extra_keys, seed=0):
+        rng = np.random.default_rng(seed)
+        self.rows = rows
+        self.cardinality = cardinality
+        self.extra_keys = extra_keys
+        self.is_str = rng.random(rows) < string_ratio
+        self.value = rng.integers(0, cardinality, rows)
+        self.extra = rng.integers(0, 1000, (rows, extra_keys))
+
+    def doc(self, i):
+        key_5 = f"s{self.value[i]}" if self.is_str[i] else int(self.value[i])
+        # Extra keys use their own prefix so they can never overwrite key_5.
+        return {"key_5": key_5, **{f"extra_{k}": int(v) for k, v in enumerate(self.extra[i])}}
+
+    def gen_batch(self, i):
+        rows = range(i * batch, min((i + 1) * batch, self.rows))
+        return [
+            np.arange(rows.start, rows.stop, dtype=np.int64),
+            np.zeros((len(rows), dim), dtype=np.float32),
+            [self.doc(r) for r in rows],
+        ]
+
+    def filters(self, num, seed=1):
+        """{name: [(expr, expected_count)]}; type-mismatched comparisons match nothing."""
+        rng = np.random.default_rng(seed)
+        is_int = ~self.is_str
+        width = max(1, self.cardinality // 10)
+        out = {"int_eq": [], "int_range": [], "str_eq": [], "str_in": []}
+        for _ in range(num):
+            v = int(rng.integers(0, self.cardinality))
+            a = int(rng.integers(0, max(1, self.cardinality - width)))
+            vs = rng.choice(self.cardinality, size=min(3, self.cardinality), replace=False)
+            out["int_eq"].append((f"{json_path} == {v}", int((is_int & (self.value == v)).sum())))
+            out["int_range"].append((f"{json_path} >= {a} and {json_path} < {a + width}",
+                                     int((is_int & (self.value >= a) & (self.value < a + width)).sum())))
+            out["str_eq"].append((f'{json_path} == "s{v}"', int((self.is_str & (self.value == v)).sum())))
+            strings = ", ".join(f'"s{x}"' for x in vs.tolist())
+            out["str_in"].append((f"{json_path} in [{strings}]",
+                                  int((self.is_str & np.isin(self.value, vs)).sum())))
+        return out
+
+
+def load_collection(data, concurrency):
+    utility.drop_collection(collection_name)
+    schema = CollectionSchema([
+        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=False),
+        FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
+        FieldSchema(name="json", dtype=DataType.JSON),
+    ])
+    collection = Collection(collection_name, schema)
+    collection.create_index("vector", {"index_type": "FLAT", "metric_type": "L2", "params": {}},
+                            index_name="vector")
+    PipelinedInserter(uri, collection_name, concurrency=concurrency, progress_every=0).run(
+        data.gen_batch, -(-data.rows // batch))
+    collection.flush()
+    return collection
+
+
+def set_json_index(collection, cast_type):
+    """Replace the key_5 path index (None = no index) and reload. Returns build+load seconds."""
+    collection.release()
+    if collection.has_index(index_name=json_index_name):
+        collection.drop_index(index_name=json_index_name)
+    start = time.perf_counter()
+    if cast_type:
+        collection.create_index("json", {
+            "index_type": "INVERTED",
+            "params": {"json_path": json_path, "json_cast_type": cast_type},
+        }, index_name=json_index_name)
+        utility.wait_for_index_building_complete(collection_name, index_name=json_index_name)
+    collection.load()
+    return time.perf_counter() - start
+
+
+def measure(collection, filters):
+    rows = []
+    for name, cases in filters.items():
+        latencies, correct = [], 0
+        for expr, expected in cases:
+            t0 = time.perf_counter()
+            res = collection.query(expr=expr, output_fields=["count(*)"], consistency_level="Strong")
+            latencies.append((time.perf_counter() - t0) * 1000)
+            correct += res[0]["count(*)"] == expected
+        p = percentiles(latencies)
+        rows.append({"filter": name, "p50_ms": p["p50"], "p99_ms": p["p99"],
+                     "avg_matched": float(np.mean([e for _, e in cases])), "correct": f"{correct}/{len(cases)}"})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--cardinality", type=int, default=1000, help="distinct key_5 values")
+    parser.add_argument("--extra-keys", type=int, default=8, help="other int keys per document")
+    parser.add_argument("--string-ratios", default="0,0.4,1", help="fractions of string-typed key_5 values")
+    parser.add_argument("--cast-types", default="double,varchar", help="JSON path index cast types to try")
+    parser.add_argument("--queries", type=int, default=50, help="queries per filter kind")
+    parser.add_argument("--concurrency", type=int, default=4, help="insert concurrency")
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    connections.connect("default", uri=uri)
+    print(utility.get_server_version())
+
+    results = []
+    for ratio in [float(v) for v in args.string_ratios.split(",")]:
+        data = JsonData(args.rows, args.cardinality, ratio, args.extra_keys)
+        collection = load_collection(data, args.concurrency)
+        filters = data.filters(args.queries)
+        for cast_type in [None] + args.cast_types.split(","):
+            index_s = set_json_index(collection, cast_type)
+            for row in measure(collection, filters):
+                results.append({"string_ratio": ratio, "index": cast_type or "none",
+                                "index_load_s": index_s, **row})
+            print(f"  string_ratio={ratio} index={cast_type or 'none'} done")
+    utility.drop_collection(collection_name)
+
+    print(f"\n========== JSON FILTER LATENCY (rows={args.rows}, cardinality={args.cardinality}) ==========")
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
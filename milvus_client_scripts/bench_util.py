@@ -0,0 +1,156 @@
+"""
+Benchmark helpers shared by the scripts in this directory and tests/test_milvus/
+(whose bench_common.py re-exports them): latency recording with percentiles,
+rows/s pacers for threads and processes, and table/CSV output.
+"""
+
+import csv
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+
+# Some benchmarks call private pymilvus APIs to time steps the public API hides.
+# Those are not covered by pymilvus' compatibility promises; they were written
+# against this release line and are checked up front with require_internals().
+PYMILVUS_INTERNALS_VERSION = "2.5"
+
+
+def require_internals(obj, *names, purpose):
+    """Raise RuntimeError unless `obj` has every private attribute in `names` (dotted paths allowed)."""
+    missing = []
+    for name in names:
+        target = obj
+        for part in name.split("."):
+            target = getattr(target, part, None)
+            if target is None:
+                missing.append(name)
+                break
+    if missing:
+        import pymilvus
+        raise RuntimeError(f"{purpose} needs private pymilvus APIs {', '.join(missing)}, which pymilvus "
+                           f"{pymilvus.__version__} lacks; it was written against pymilvus "
+                           f"{PYMILVUS_INTERNALS_VERSION}.x")
+
+
+def percentiles(values, ps=(50, 95, 99)):
+    """Return {"p50": ..., ...} in the unit of `values`; empty input gives NaN."""
+    if len(values) == 0:
+        return {f"p{p}": float("nan") for p in ps}
+    arr = np.asarray(values, dtype=np.float64)
+    return {f"p{p}": float(v) for p, v in zip(ps, np.percentile(arr, ps))}
+
+
+class LatencyStats:
+    """Thread-safe collector of per-request latencies (seconds) and row counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.rows = 0
+        self.errors = 0
+
+    def record(self, seconds, rows=0):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.rows += rows
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self, elapsed):
+        """Throughput and latency (ms) summary for a run that took `elapsed` seconds."""
+        ms = [v * 1000 for v in self.latencies]
+        out = {
+            "requests": len(ms),
+            "errors": self.errors,
+            "rows": self.rows,
+            "seconds": elapsed,
+            "rows_per_s": self.rows / elapsed if elapsed else 0.0,
+            "qps": len(ms) / elapsed if elapsed else 0.0,
+        }
+        out.update({f"{k}_ms": v for k, v in percentiles(ms).items()})
+        out["max_ms"] = max(ms) if ms else float("nan")
+        return out
+
+
+class RatePacer:
+    """Pace work to a target rate (units/s) on a fixed schedule; rate <= 0 disables pacing.
+
+    Thread-safe: each acquire(n) reserves the next n units of the schedule and sleeps
+    until they are due, so bursts after a stall are bounded by the schedule.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._start = None
+        self._sent = 0
+
+    def _reserve(self, units):
+        """Book the next `units` of the schedule and return when they are due (time.time())."""
+        with self._lock:
+            if self._start is None:
+                self._start = time.time()
+            due = self._start + self._sent / self.rate
+            self._sent += units
+        return due
+
+    def acquire(self, units=1):
+        if self.rate <= 0:
+            return
+        delay = self._reserve(units) - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SharedRatePacer(RatePacer):
+    """RatePacer whose schedule lives in shared memory, for pacing across processes.
+
+    Create it in the parent and hand it to multiprocessing.Process workers as an
+    argument (it cannot go through a Pool).
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._start = multiprocessing.Value("d", 0.0)
+        self._sent = multiprocessing.Value("d", 0.0, lock=False)
+
+    def _reserve(self, units):
+        with self._start.get_lock():
+            if self._start.value == 0.0:
+                self._start.value = time.time()
+            due = self._start.value + self._sent.value / self.rate
+            self._sent.value += units
+        return due
+
+
+def print_table(rows, columns=None):
+    """Print a list of dicts as an aligned text table."""
+    if not rows:
+        return
+    columns = columns or list(rows[0].keys())
+
+    def fmt(v):
+        return f"{v:.2f}" if isinstance(v, float) else str(v)
+
+    widths = {c: max(len(c), *(len(fmt(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(fmt(r.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+def write_csv(path, rows):
+    """Write a list of dicts to CSV, appending if the file already exists."""
+    if not rows:
+        return
+    exists = os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        if not exists:
+            writer.writeheader()
+        writer.writerows(rows)
+    print(f"Results written to {path}")
@@ -1,10 +1,15 @@
 from pymilvus import *
+import argparse
 import numpy as np
 import random
-import string
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pymilvus.grpc_gen import common_pb2
 
+from bench_util import LatencyStats, percentiles, print_table
+from ground_truth import exact_knn, recall_at_k, result_ids
+from pipelined_insert import PipelinedInserter
+
 ConsistencyLevel = common_pb2.ConsistencyLevel
 
 collection_name = "hello_milvus_float16"
@@ -13,7 +18,8 @@ dim = 128
 batch = 10000
 batch_count = 20
 
-client = MilvusClient()
+uri = "http://localhost:19530"
+client = MilvusClient(uri)
 connections.connect("default", host="localhost", port="19530")
 # connections.connect("default", host="10.104.15.215", port="19530")
 # client = MilvusClient("http://10.104.21.146:19530")
@@ -46,43 +52,53 @@ def prepare_collection():
     )
 
 
-def insert():
-    _len = int(20)
-    _str = string.ascii_letters + string.digits + " "
-    _s = _str
-    print("_str size ", len(_str))
-
-    for i in range(int(_len / len(_str))):
-        _s += _str
-        print("append str ", i)
-    values = [''.join(random.sample(_s, _len - 1)) for _ in range(batch)]
-
-    i = 0
-    while i < batch_count:
-        # insert data
-        data = [
-            [i*batch+j for j in range(batch)],  # id
-            [j for j in range(batch)],  # timestamp
-            [random.random() for _ in range(batch)], #float
-            [[random.random() for _ in range(dim)] for _ in range(batch)],  # vector
-        ]
-
-        start = time.time()
-        try:
-            # _, vectors = gen_fp16_vectors(batch, dim)
-            rows = [{"id": data[0][i], "vector": data[3][i], "timestamp": data[1][i], "float": data[2][i],
-                     "varchar": f"FLrjqelpnB3b6ZKOWUZY9iV1JIb829iNyFH4V75CR7DzNKmTaUx5lgScA3QQXpazHsyAekk20uBMhhdfTPvomYDr1LvgPcoGW0E{data[0][i]}"}
-                    for i in range(batch)]
-            # rows = [{"id": data[0][i], "vector": data[1][i]} for i in range(batch)]
-
-            insert_result = client.insert(collection_name, rows)
-        except Exception as e:
-            print("insert failed: ", e)
-        dur = time.time() - start
-        print("insert %d %d done in %f" % (i, batch, dur))
-        i += 1
+VARCHAR_PREFIX = "FLrjqelpnB3b6ZKOWUZY9iV1JIb829iNyFH4V75CR7DzNKmTaUx5lgScA3QQXpazHsyAekk20uBMhhdfTPvomYDr1LvgPcoGW0E"
+
+
+# Clustering-key ("timestamp") distribution used by gen_batch; see gen_clustering_keys.
+KEY_DISTRIBUTIONS = ("cyclic", "sequential", "uniform", "normal", "zipf")
+key_distribution = "uniform"
+key_range = batch
+total_rows = batch * batch_count
+
+
+def gen_clustering_keys(i, rng):
+    """Clustering keys for batch i, in [0, key_range)."""
+    if key_distribution == "cyclic":  # 0..batch-1 in every batch
+        return np.arange(batch, dtype=np.int64) % key_range
+    if key_distribution == "sequential":  # already sorted across the whole load
+        rows = np.arange(i * batch, (i + 1) * batch, dtype=np.int64)
+        return rows * key_range // total_rows
+    if key_distribution == "uniform":
+        return rng.integers(0, key_range, batch, dtype=np.int64)
+    if key_distribution == "normal":
+        keys = rng.normal(key_range / 2, key_range / 8, batch)
+        return np.clip(keys, 0, key_range - 1).astype(np.int64)
+    if key_distribution == "zipf":
+        return (rng.zipf(1.2, batch) - 1) % key_range
+    raise ValueError(f"unknown key distribution: {key_distribution}")
+
+
+def gen_batch(i):
+    """Column-based batch i in schema order: id, timestamp, float, varchar, vector."""
+    rng = np.random.default_rng(i)
+    ids = np.arange(i * batch, (i + 1) * batch, dtype=np.int64)
+    return [
+        ids,
+        gen_clustering_keys(i, rng),
+        rng.random(batch, dtype=np.float32),
+        [f"{VARCHAR_PREFIX}{j}" for j in ids.tolist()],
+        rng.random((batch, dim), dtype=np.float32),
+    ]
+
+
+def insert(concurrency=4, producers=1, num_batches=None):
+    inserter = PipelinedInserter(uri, collection_name, concurrency=concurrency, producers=producers)
+    summary = inserter.run(gen_batch, num_batches or batch_count)
+    print_table([summary])
     client.flush(collection_name)
     print(f"Number of entities in Milvus: {client.get_collection_stats(collection_name)}")  # check the num_entites
+    return summary
 
 
 def query_with_expr():
@@ -109,40 +125,288 @@ def search_with_expr():
         res = client.search(collection_name, vectors, filter=search_expr, output_fields=["id", "timestamp"],
                             anns_field="vector")
         print(res)
-        print("pytorch Tensor: ", torch.frombuffer(res[0][0].get("bfloat16_vector"), dtype=torch.bfloat16))
 
 
 fp16_little = np.dtype('e').newbyteorder('<')
 
+# Optional: gives NumPy a real bfloat16 dtype that pymilvus accepts directly.
+try:
+    import ml_dtypes
+    bf16_dtype = np.dtype(ml_dtypes.bfloat16)
+except ImportError:
+    bf16_dtype = None
+
+HALF_VECTOR_TYPES = {
+    "fp16": DataType.FLOAT16_VECTOR,
+    "bf16": DataType.BFLOAT16_VECTOR,
+}
+
+
+def gen_fp16_vectors(num, dim, rng=None):
+    """Return (float32 source, float16 buffer), both contiguous (num, dim) arrays."""
+    rng = rng or np.random.default_rng()
+    raw_vectors = rng.random((num, dim), dtype=np.float32)
+    return raw_vectors, raw_vectors.astype(fp16_little)
+
+
+def gen_bf16_vectors(num, dim, rng=None):
+    """Return (float32 source, bfloat16 buffer as a contiguous little-endian uint16 (num, dim) array).
 
-def gen_fp16_vectors(num, dim):
-    raw_vectors = []
-    fp16_vectors = []
-    for _ in range(num):
-        raw_vector = [random.random() for _ in range(dim)]
-        raw_vectors.append(raw_vector)
-        fp16_vector = np.array(raw_vector, dtype=fp16_little)
-        fp16_vectors.append(fp16_vector)
-    return raw_vectors, fp16_vectors
-
-
-def gen_bf16_vectors(num, dim):
-    raw_vectors = []
-    bf16_vectors = []
-    for _ in range(num):
-        raw_vector = [random.random() for _ in range(dim)]
-        raw_vectors.append(raw_vector)
-        # Numpy itself does not support bfloat16, use TensorFlow extension instead.
-        # PyTorch does not support converting bfloat16 vector to numpy array.
-        # See:
-        # - https://github.com/numpy/numpy/issues/19808
-        # - https://github.com/pytorch/pytorch/issues/90574
-        bf16_vector = tf.cast(raw_vector, dtype=tf.bfloat16).numpy()
-        bf16_vectors.append(bf16_vector)
+    Numpy itself does not support bfloat16 (https://github.com/numpy/numpy/issues/19808), but
+    bfloat16 is the upper half of a float32, so truncation is one shift over the uint32 view.
+    """
+    rng = rng or np.random.default_rng()
+    raw_vectors = rng.random((num, dim), dtype=np.float32)
+    bf16_vectors = (raw_vectors.view(np.uint32) >> 16).astype("<u2")
     return raw_vectors, bf16_vectors
 
 
+def half_vector_rows(buf, kind):
+    """Rows of a (num, dim) fp16/bf16 buffer in a form pymilvus accepts.
+
+    fp16 rows, and bf16 rows when ml_dtypes is installed, are views into the one
+    batch buffer (no per-row copy); without ml_dtypes bf16 rows fall back to bytes.
+    """
+    if kind == "fp16":
+        return list(buf)
+    if bf16_dtype is not None:
+        return list(buf.view(bf16_dtype))
+    return [row.tobytes() for row in buf]
+
+
+def prepare_half_collection(kind, name=None):
+    """Create an id + fp16/bf16 vector collection with an HNSW index. Returns its name."""
+    name = name or f"{collection_name}_{kind}"
+    client.drop_collection(name)
+    schema = client.create_schema(auto_id=False)
+    schema.add_field("id", DataType.INT64, is_primary=True)
+    schema.add_field("vector", HALF_VECTOR_TYPES[kind], dim=dim)
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name="vector", index_type="HNSW", metric_type="L2",
+                           params={"M": 16, "efConstruction": 200})
+    client.create_collection(name, schema=schema, index_params=index_params,
+                             consistency_level=ConsistencyLevel.Session)
+    return name
+
+
+def insert_half(kind, num_batches=batch_count, concurrency=4, name=None):
+    """Load num_batches * batch fp16/bf16 vectors through the insert pipeline."""
+    name = prepare_half_collection(kind, name)
+    gen = gen_fp16_vectors if kind == "fp16" else gen_bf16_vectors
+
+    def gen_half_batch(i):
+        _, buf = gen(batch, dim, np.random.default_rng(i))
+        return [np.arange(i * batch, (i + 1) * batch, dtype=np.int64), half_vector_rows(buf, kind)]
+
+    summary = PipelinedInserter(uri, name, concurrency=concurrency).run(gen_half_batch, num_batches)
+    summary["mb_per_s"] = summary["rows_per_s"] * dim * 2 / 1024 / 1024
+    print_table([summary])
+    return summary
+
+
+def wait_for_compaction(job_id, timeout=3600):
+    start = time.time()
+    while time.time() - start < timeout:
+        state = client.get_compaction_state(job_id)
+        if state == "Completed":
+            return time.time() - start
+        time.sleep(1)
+    raise TimeoutError(f"compaction {job_id} not completed within {timeout}s")
+
+
+def wait_for_vector_index(timeout=3600):
+    """Block until every flushed segment has its vector index, so measurements compare indexed data."""
+    start = time.time()
+    utility.wait_for_index_building_complete(collection_name, index_name="vector", timeout=timeout)
+    return time.time() - start
+
+
+def measure_key_filters(num_queries, seed=0):
+    """Query/search latency (ms) for point and range filters on the clustering key.
+
+    The same seed gives the same filters and query vectors, so before/after runs compare like for like.
+    """
+    rng = np.random.default_rng(seed)
+    width = max(1, key_range // 100)
+    points = rng.integers(0, key_range, num_queries)
+    starts = rng.integers(0, max(1, key_range - width), num_queries)
+    vectors = rng.random((num_queries, dim), dtype=np.float32)
+    filters = {
+        "point": [f"timestamp == {v}" for v in points],
+        "range": [f"timestamp >= {a} and timestamp < {a + width}" for a in starts],
+    }
+
+    results = []
+    for kind, exprs in filters.items():
+        query_ms, search_ms = [], []
+        for expr, vec in zip(exprs, vectors):
+            t0 = time.perf_counter()
+            client.query(collection_name, filter=expr, output_fields=["count(*)"])
+            query_ms.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            client.search(collection_name, [vec.tolist()], filter=expr, limit=10, anns_field="vector")
+            search_ms.append((time.perf_counter() - t0) * 1000)
+        for op, values in (("query", query_ms), ("search", search_ms)):
+            results.append({"filter": kind, "op": op, **percentiles(values)})
+    return results
+
+
+def configure(rows, distribution, keys):
+    """Set the data shape used by gen_batch. Returns the number of batches for `rows`."""
+    global key_distribution, key_range, total_rows
+    key_distribution, key_range = distribution, keys
+    num_batches = -(-rows // batch)
+    total_rows = num_batches * batch
+    return num_batches
+
+
+def benchmark(rows, distribution, keys, num_queries, concurrency, settle):
+    """Load rows, compare clustering-key filter latency before and after clustering compaction."""
+    num_batches = configure(rows, distribution, keys)
+
+    prepare_collection()
+    insert(concurrency=concurrency, num_batches=num_batches)
+    print(f"vector index built in {wait_for_vector_index():.1f}s")
+    time.sleep(settle)  # let query nodes swap in the indexed segments
+
+    before = measure_key_filters(num_queries)
+
+    job_id = client.compact(collection_name, is_clustering=True)
+    print(f"clustering compaction {job_id} started")
+    compaction_s = wait_for_compaction(job_id)
+    print(f"clustering compaction cost: {compaction_s:.1f}s")
+    print(f"vector index on compacted segments built in {wait_for_vector_index():.1f}s")
+    time.sleep(settle)  # let query nodes pick up the compacted, indexed segments
+
+    after = measure_key_filters(num_queries)
+
+    report = []
+    for b, a in zip(before, after):
+        report.append({
+            "filter": b["filter"], "op": b["op"],
+            "before_p50": b["p50"], "after_p50": a["p50"],
+            "before_p99": b["p99"], "after_p99": a["p99"],
+            "speedup_p50": b["p50"] / a["p50"] if a["p50"] else float("nan"),
+        })
+    print(f"\nrows={total_rows} distribution={distribution} key_range={keys} "
+          f"compaction={compaction_s:.1f}s (latency in ms)")
+    print_table(report)
+    return report
+
+
+def filter_matrix(rng, text_terms=100):
+    """(name, expr, mask) filters for the search benchmark.
+
+    mask(columns) evaluates the same predicate locally on the columns from gen_batch,
+    so ground truth can be computed with NumPy. Thresholds are relative to key_range.
+    """
+    half, tenth, hundredth = key_range // 2, max(1, key_range // 10), max(1, key_range // 100)
+    a = int(rng.integers(0, max(1, key_range - tenth)))
+    b = int(rng.integers(0, max(1, key_range - hundredth)))
+    terms = rng.choice(total_rows, size=min(text_terms, total_rows), replace=False)
+    words = " ".join(f"{VARCHAR_PREFIX}{t}" for t in terms.tolist())
+    return [
+        ("none", "", lambda c: np.ones(len(c["id"]), dtype=bool)),
+        ("arith_timestamp", f"timestamp + 1 > {half}", lambda c: c["timestamp"] + 1 > half),
+        ("arith_float", "float + 1 < 1.1", lambda c: c["float"] + np.float32(1) < np.float32(1.1)),
+        ("range_10pct", f"timestamp >= {a} and timestamp < {a + tenth}",
+         lambda c: (c["timestamp"] >= a) & (c["timestamp"] < a + tenth)),
+        ("range_1pct", f"timestamp >= {b} and timestamp < {b + hundredth}",
+         lambda c: (c["timestamp"] >= b) & (c["timestamp"] < b + hundredth)),
+        ("text_match", f"text_match(varchar, '{words}')", lambda c: np.isin(c["id"], terms)),
+    ]
+
+
+def local_columns(num_batches):
+    """Regenerate the loaded data (minus varchar) from gen_batch for ground truth."""
+    parts = [gen_batch(i) for i in range(num_batches)]
+    return {
+        "id": np.concatenate([p[0] for p in parts]),
+        "timestamp": np.concatenate([p[1] for p in parts]),
+        "float": np.concatenate([p[2] for p in parts]),
+        "vector": np.concatenate([p[4] for p in parts]),
+    }
+
+
+def search_benchmark(num_requests, nq, topk, concurrency, nprobe, seed=0):
+    """QPS, latency and recall@topk of filtered searches for each expression in filter_matrix."""
+    rng = np.random.default_rng(seed)
+    columns = local_columns(total_rows // batch)
+    queries = rng.random((num_requests, nq, dim), dtype=np.float32)
+    search_params = {"metric_type": "L2", "params": {"nprobe": nprobe}}
+
+    report = []
+    for name, expr, mask in filter_matrix(rng):
+        selected = np.flatnonzero(mask(columns))
+        base, ids = columns["vector"][selected], columns["id"][selected]
+        stats = LatencyStats()
+        recalls = []
+        truth = exact_knn(base, queries.reshape(-1, dim), topk, "L2", ids=ids)[0].reshape(num_requests, nq, -1)
+
+        def run(r):
+            t0 = time.perf_counter()
+            try:
+                res = client.search(collection_name, queries[r].tolist(), filter=expr, limit=topk,
+                                    anns_field="vector", search_params=search_params)
+            except Exception as e:
+                stats.error()
+                print(f"{name}: search failed: {e}")
+                return
+            stats.record(time.perf_counter() - t0, nq)
+            if len(ids):
+                recalls.append(recall_at_k(result_ids(res), truth[r], topk))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(run, range(num_requests)))
+        summary = stats.summary(time.perf_counter() - start)
+        report.append({
+            "filter": name, "matched": len(ids), "qps": summary["qps"],
+            "p50_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"], "p99_ms": summary["p99_ms"],
+            "recall": float(np.mean(recalls)) if recalls else float("nan"),
+            "errors": summary["errors"],
+        })
+    print(f"\nrows={total_rows} nq={nq} topk={topk} concurrency={concurrency} nprobe={nprobe}")
+    print_table(report)
+    return report
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true",
+                        help="load, compact and compare clustering-key filter latency")
+    parser.add_argument("--rows", type=int, default=batch * batch_count)
+    parser.add_argument("--distribution", choices=KEY_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--key-range", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--settle", type=float, default=10)
+    parser.add_argument("--half", choices=sorted(HALF_VECTOR_TYPES),
+                        help="load test an fp16/bf16 vector collection instead")
+    parser.add_argument("--search-bench", action="store_true",
+                        help="filtered-search QPS/latency/recall on data loaded with the same --rows/"
+                             "--distribution/--key-range")
+    parser.add_argument("--load", action="store_true", help="with --search-bench, load the data first")
+    parser.add_argument("--nq", type=int, default=10)
+    parser.add_argument("--topk", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.search_bench:
+        num_batches = configure(args.rows, args.distribution, args.key_range)
+        if args.load:
+            prepare_collection()
+            insert(concurrency=args.concurrency, num_batches=num_batches)
+        client.load_collection(collection_name)
+        search_benchmark(args.queries, args.nq, args.topk, args.concurrency, args.nprobe)
+    elif args.half:
+        insert_half(args.half, num_batches=-(-args.rows // batch), concurrency=args.concurrency)
+    elif args.bench:
+        benchmark(args.rows, args.distribution, args.key_range, args.queries,
+                  args.concurrency, args.settle)
+    else:
+        client.compact(collection_name, is_clustering=True)
+
     # prepare_collection()
 
     # insert()
@@ -153,14 +417,7 @@ if __name__ == "__main__":
     #     index_name="vector",
     #     metric_type="L2",
     # )
-    # start = time.time()
     # client.create_index(collection_name, index_params=index_params)
-    # end = time.time()
-    # # print("index cost: ", end-start)
-    # # time.sleep(5)
-    client.compact(collection_name, is_clustering=True)
-    # end2 = time.time()
-    # print("clustering compaction cost: ", end2-end)
 
     # client.release_collection(collection_name)
 
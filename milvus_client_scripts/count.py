@@ -1,41 +1,131 @@
-from pymilvus import connections, Collection, utility
+"""
+Row-count audit across collections.
+
+Two modes, usable together:
+  cheap:  no load required. stats_rows is get_collection_stats (num_entities),
+          segment_rows is the sum of flushed segment row counts. Both ignore
+          deletes that have not been compacted away, and unflushed rows.
+  exact:  count(*) over a loaded collection, split into --splits primary-key
+          partitions counted in parallel. INT64 keys are split by modulo
+          (pk % N), so no key bounds are needed, or by range with
+          --pk-min/--pk-max; VARCHAR keys get a single count(*).
+The report lists each collection's counts and the difference between the
+cheap and exact numbers.
+
+Usage:
+  python count.py fouram_igMEwJbQ --mode exact
+  python count.py 'fouram_*' --mode both --splits 16 --concurrency 8 --uri http://10.104.24.90:19530
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymilvus import connections, Collection, DataType, utility
+from pymilvus.client.types import LoadState
+
+from bench_util import print_table
+from reload import resolve_collections
+
+MODES = ("cheap", "exact", "both")
+
 
 # Step 1: Connect to the Milvus server
-def connect_to_milvus(host='localhost', port='19530'):
+def connect_to_milvus(uri="http://localhost:19530"):
     print("Connecting to Milvus...")
-    connections.connect(host=host, port=port)
+    connections.connect(uri=uri)
     print("Connected to Milvus!")
 
-# Step 2: Count the number of entities in a collection using query
-def count_entities(collection_name):
-    # Check if the collection exists
-    if not utility.has_collection(collection_name):
-        print(f"Collection '{collection_name}' does not exist.")
-        return
 
-    # Load the collection
+def cheap_count(collection_name):
+    """(stats_rows, segment_rows) without loading the collection."""
     collection = Collection(collection_name)
-    collection.load()
+    segments = utility.get_persistent_segment_info(collection_name)
+    return collection.num_entities, sum(s.num_rows for s in segments)
+
+
+def pk_filters(pk_field, splits, pk_range=None):
+    """Filters that together cover every primary key exactly once."""
+    name = pk_field.name
+    if pk_field.dtype != DataType.INT64 or splits <= 1:
+        return [""]
+    if pk_range:
+        lo, hi = pk_range
+        step = max(1, -(-(hi - lo) // splits))
+        bounds = list(range(lo, hi, step)) + [hi]
+        filters = [f"{a} <= {name} < {b}" for a, b in zip(bounds, bounds[1:])]
+        return [f"{name} < {lo}"] + filters + [f"{name} >= {hi}"]
+    # Remainders of negative keys are negative, so pair i with -i.
+    return [f"{name} % {splits} == 0"] + [f"({name} % {splits} == {i} or {name} % {splits} == {-i})"
+                                          for i in range(1, splits)]
+
+
+# Step 2: Count the number of entities in a collection using query
+def exact_count(collection_name, splits=8, pk_range=None, consistency_level="Strong", workers=8):
+    """Exact row count as the sum of parallel count(*) queries over PK partitions."""
+    collection = Collection(collection_name)
+    pk_field = next(f for f in collection.schema.fields if f.is_primary)
+    filters = pk_filters(pk_field, splits, pk_range)
+
+    def count(expr):
+        results = collection.query(expr=expr, output_fields=["count(*)"], consistency_level=consistency_level)
+        return results[0]["count(*)"]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(filters))) as pool:
+        return sum(pool.map(count, filters))
+
+
+def audit(names, mode="both", splits=8, pk_range=None, load=False, concurrency=4):
+    """Count every collection in `names`. Returns one report row per collection."""
+    def audit_one(name):
+        row = {"collection": name, "stats_rows": None, "segment_rows": None,
+               "exact_rows": None, "diff": None, "seconds": 0.0, "note": ""}
+        start = time.perf_counter()
+        try:
+            if mode in ("cheap", "both"):
+                row["stats_rows"], row["segment_rows"] = cheap_count(name)
+            if mode in ("exact", "both"):
+                if utility.load_state(name) != LoadState.Loaded:
+                    if not load:
+                        row["note"] = "not loaded, exact count skipped"
+                        return row
+                    Collection(name).load()
+                row["exact_rows"] = exact_count(name, splits, pk_range)
+                if row["stats_rows"] is not None:
+                    row["diff"] = row["stats_rows"] - row["exact_rows"]
+        except Exception as e:
+            row["note"] = str(e)
+        finally:
+            row["seconds"] = time.perf_counter() - start
+        return row
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(audit_one, names))
 
-    # Query to count all entities
-    expr = "900000<=id<1000000"  # A filter that matches all entities
-    results = collection.query(expr=expr, output_fields=["count(*)"])
-    
-    # Extract the count from the query results
-    num_entities = results[0]["count(*)"]
-    print(f"Number of entities in collection '{collection_name}': {num_entities}")
 
 # Main function
 if __name__ == "__main__":
-    # Milvus connection parameters
-    HOST = '10.104.24.90'  # Milvus server address
-    PORT = '19530'      # Milvus server port
+    parser = argparse.ArgumentParser()
+    parser.add_argument("collections", nargs="+", help="collection names or glob patterns")
+    parser.add_argument("--uri", default="http://localhost:19530")
+    parser.add_argument("--mode", choices=MODES, default="both")
+    parser.add_argument("--splits", type=int, default=8, help="parallel count(*) queries per collection")
+    parser.add_argument("--pk-min", type=int, default=None)
+    parser.add_argument("--pk-max", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=4, help="collections audited at once")
+    parser.add_argument("--load", action="store_true", help="load collections that are not loaded (exact mode)")
+    args = parser.parse_args()
 
-    # Collection name
-    COLLECTION_NAME = 'fouram_igMEwJbQ'  # Replace with your collection name
+    pk_range = (args.pk_min, args.pk_max) if args.pk_min is not None and args.pk_max is not None else None
 
     # Connect to Milvus
-    connect_to_milvus(host=HOST, port=PORT)
+    connect_to_milvus(uri=args.uri)
 
-    # Count entities in the collection using query
-    count_entities(COLLECTION_NAME)
+    start = time.perf_counter()
+    report = audit(resolve_collections(args.collections), args.mode, args.splits, pk_range,
+                   args.load, args.concurrency)
+    print(f"\nCounted {len(report)} collections in {time.perf_counter() - start:.1f}s")
+    print_table(report)
+    mismatched = [r["collection"] for r in report if r["diff"]]
+    if mismatched:
+        print(f"stats_rows != exact_rows for: {', '.join(mismatched)}")
@@ -1,9 +1,43 @@
-from pymilvus import connections, Collection
+"""
+Flush many collections concurrently and track how long persistence takes.
+
+For each collection the Flush RPC seals its growing segments and returns their
+ids with a flush timestamp; get_flush_state is then polled until those
+segments are persisted. Reported per collection:
+  - seal_s:      Flush RPC latency (growing segments sealed)
+  - persist_s:   time from the RPC returning until get_flush_state is true
+  - segments and rows of flushed segments before and after
+The split needs the raw Flush RPC, a private pymilvus API (see
+bench_util.PYMILVUS_INTERNALS_VERSION). Without it, the public
+Collection.flush() is timed as a whole and only flush_s is reported.
+Run with --repeat/--interval while an ingest job is writing to measure flush
+cost under load.
+
+Usage:
+  python flush.py fouram_CaUszFZ8 --uri http://10.104.26.93:19530
+  python flush.py 'bench_*' --concurrency 8 --repeat 10 --interval 30
+"""
+
+import argparse
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymilvus import connections, Collection, utility
+from pymilvus.client.prepare import Prepare
+from pymilvus.client.utils import check_status
+
+from bench_util import percentiles, print_table, require_internals
+from reload import resolve_collections
+
+FLUSH_POLL_INTERVAL = 0.2
+DEFAULT_FLUSH_TIMEOUT = 600
+
 
 def flush_collection(collection_name: str, host: str = "localhost", port: str = "19530"):
     """
     Flush a Milvus collection to ensure all data is persisted to disk.
-    
+
     Args:
         collection_name (str): Name of the collection to flush
         host (str): Milvus server host
@@ -13,15 +47,15 @@ def flush_collection(collection_name: str, host: str = "localhost", port: str =
         # Connect to Milvus server
         connections.connect(host=host, port=port)
         print(f"Connected to Milvus server at {host}:{port}")
-        
+
         # Get the collection
         collection = Collection(collection_name)
         print(f"Got collection: {collection_name}")
-        
+
         # Flush the collection
         collection.flush()
         print(f"Successfully flushed collection: {collection_name}")
-        
+
     except Exception as e:
         print(f"Error flushing collection: {str(e)}")
     finally:
@@ -29,7 +63,96 @@ def flush_collection(collection_name: str, host: str = "localhost", port: str =
         connections.disconnect("default")
         print("Disconnected from Milvus server")
 
+
+def _flushed_segments(collection_name, alias):
+    segments = utility.get_persistent_segment_info(collection_name, using=alias)
+    return len(segments), sum(s.num_rows for s in segments)
+
+
+@functools.lru_cache(maxsize=None)
+def _split_handler(alias):
+    """Connection handler for the seal/persist split, or None if this pymilvus lacks the internals."""
+    try:
+        require_internals(connections, "_fetch_handler", purpose="flush seal/persist timing")
+        handler = connections._fetch_handler(alias)
+        require_internals(handler, "_stub.Flush", "get_flush_state", purpose="flush seal/persist timing")
+    except RuntimeError as e:
+        print(f"{e}; timing Collection.flush() as a whole instead")
+        return None
+    return handler
+
+
+def timed_flush(collection_name, alias="default", timeout=DEFAULT_FLUSH_TIMEOUT):
+    """Flush one collection, split into seal (Flush RPC) and persist (get_flush_state) time."""
+    handler = _split_handler(alias)
+    result = {"collection": collection_name}
+    result["segments_before"], result["rows_before"] = _flushed_segments(collection_name, alias)
+
+    t0 = time.perf_counter()
+    if handler is None:
+        Collection(collection_name, using=alias).flush(timeout=timeout)
+        nan = float("nan")
+        result.update({"sealed": nan, "seal_s": nan, "persist_s": nan, "flush_s": time.perf_counter() - t0})
+        result["segments_after"], result["rows_after"] = _flushed_segments(collection_name, alias)
+        return result
+
+    resp = handler._stub.Flush(Prepare.flush_param([collection_name]), timeout=timeout)
+    check_status(resp.status)
+    t1 = time.perf_counter()
+    segment_ids = list(resp.coll_segIDs[collection_name].data)
+    flush_ts = resp.coll_flush_ts[collection_name]
+    while not handler.get_flush_state(segment_ids, collection_name, flush_ts):
+        if time.perf_counter() - t1 > timeout:
+            raise TimeoutError(f"{collection_name}: segments {segment_ids} not flushed within {timeout}s")
+        time.sleep(FLUSH_POLL_INTERVAL)
+    t2 = time.perf_counter()
+
+    result.update({"sealed": len(segment_ids), "seal_s": t1 - t0, "persist_s": t2 - t1, "flush_s": t2 - t0})
+    result["segments_after"], result["rows_after"] = _flushed_segments(collection_name, alias)
+    return result
+
+
+def flush_collections(names, concurrency=4, alias="default", timeout=DEFAULT_FLUSH_TIMEOUT):
+    """Flush `names` with at most `concurrency` in flight. Returns per-collection results."""
+    def flush(name):
+        try:
+            return timed_flush(name, alias, timeout)
+        except Exception as e:
+            print(f"Error flushing collection {name}: {e}")
+            return {"collection": name, "error": str(e)}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(flush, names))
+    elapsed = time.perf_counter() - start
+    print(f"Flushed {sum('error' not in r for r in results)}/{len(names)} collections in {elapsed:.1f}s")
+    return results
+
+
 if __name__ == "__main__":
-    # Example usage
-    collection_name = "fouram_CaUszFZ8"  # Replace with your collection name
-    flush_collection(collection_name, host="10.104.26.93")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("collections", nargs="+", help="collection names or glob patterns")
+    parser.add_argument("--uri", default="http://localhost:19530")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_FLUSH_TIMEOUT)
+    parser.add_argument("--repeat", type=int, default=1, help="flush rounds")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between rounds")
+    args = parser.parse_args()
+
+    connections.connect("default", uri=args.uri)
+    names = resolve_collections(args.collections)
+
+    all_results = []
+    for round_no in range(args.repeat):
+        if round_no:
+            time.sleep(args.interval)
+        results = flush_collections(names, args.concurrency, timeout=args.timeout)
+        print_table([r for r in results if "error" not in r])
+        all_results.extend(r for r in results if "error" not in r)
+
+    if args.repeat > 1 and all_results:
+        print("\n========== FLUSH LATENCY OVER ALL ROUNDS (s) ==========")
+        print_table([{"step": step, "count": len(all_results),
+                      **percentiles([r[step] for r in all_results])}
+                     for step in ("seal_s", "persist_s", "flush_s")])
+    connections.disconnect("default")
@@ -0,0 +1,162 @@
+"""
+Exact kNN ground truth and recall@k for the search scripts in this directory.
+
+Base vectors can be a NumPy array or a memory-mapped .npy file (see
+write_vectors/open_vectors), so datasets larger than RAM are scanned block by
+block: each block of base rows is scored against a block of queries with one
+matrix multiply and folded into a running top-k.
+
+Distances follow Milvus conventions: L2 is the squared Euclidean distance
+(smaller is closer), IP and COSINE are similarities (larger is closer).
+
+Usage from a script:
+  truth_ids, truth_dist = exact_knn(base, queries, k=10, metric="L2")
+  recall = recall_at_k(result_ids(client.search(...)), truth_ids, k=10)
+
+Usage from the command line:
+  python ground_truth.py base.npy queries.npy --k 100 --metric COSINE --out gt.npy
+"""
+
+import argparse
+
+import numpy as np
+
+METRICS = ("L2", "IP", "COSINE")
+DEFAULT_BLOCK_ROWS = 65536
+DEFAULT_QUERY_BLOCK = 1024
+
+
+def write_vectors(path, batches, num, dim, dtype=np.float32):
+    """Stream (rows, dim) batches into a .npy file without holding them all in memory."""
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(num, dim))
+    offset = 0
+    for b in batches:
+        out[offset:offset + len(b)] = b
+        offset += len(b)
+    if offset != num:
+        raise ValueError(f"wrote {offset} rows to {path}, expected {num}")
+    out.flush()
+    return out
+
+
+def open_vectors(path):
+    """Memory-map a .npy vector file read-only."""
+    return np.load(path, mmap_mode="r")
+
+
+def _normalize(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1, norms)
+
+
+def _block_keys(base_block, queries, metric):
+    """Sort keys (smaller is closer) of a base block against queries."""
+    if metric == "L2":
+        return (base_block * base_block).sum(axis=1)[None, :] - 2 * queries @ base_block.T
+    if metric == "COSINE":
+        base_block = _normalize(base_block)
+    return -(queries @ base_block.T)
+
+
+def _merge_topk(keys, rows, k):
+    """Keep the k smallest keys per query row, sorted, with their base row numbers."""
+    if keys.shape[1] > k:
+        part = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        keys = np.take_along_axis(keys, part, axis=1)
+        rows = np.take_along_axis(rows, part, axis=1)
+    order = keys.argsort(axis=1, kind="stable")
+    return np.take_along_axis(keys, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+def exact_knn(base, queries, k, metric="L2", ids=None, block_rows=DEFAULT_BLOCK_ROWS,
+              query_block=DEFAULT_QUERY_BLOCK):
+    """
+    Exact top-k neighbours of each query in base.
+
+    Args:
+        base: (n, dim) array or memmap
+        queries: (nq, dim) array
+        k: neighbours per query; fewer are returned when n < k
+        metric: "L2", "IP" or "COSINE"
+        ids: optional (n,) primary keys; returned instead of base row numbers
+        block_rows: base rows scored per matrix multiply (bounds memory to
+            query_block * block_rows floats)
+        query_block: queries scored per pass over base
+
+    Returns:
+        (ids, distances), both (nq, min(k, n)), closest first.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"unsupported metric {metric}, expected one of {METRICS}")
+    queries = np.asarray(queries, dtype=np.float32)
+    if metric == "COSINE":
+        queries = _normalize(queries)
+    n = base.shape[0]
+    k = min(k, n)
+    if k == 0:
+        empty = np.empty((len(queries), 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+
+    all_keys, all_rows = [], []
+    for q0 in range(0, len(queries), query_block):
+        q = queries[q0:q0 + query_block]
+        best_keys = np.empty((len(q), 0), dtype=np.float32)
+        best_rows = np.empty((len(q), 0), dtype=np.int64)
+        for b0 in range(0, n, block_rows):
+            block = np.asarray(base[b0:b0 + block_rows], dtype=np.float32)
+            keys = _block_keys(block, q, metric)
+            rows = np.broadcast_to(np.arange(b0, b0 + len(block), dtype=np.int64), keys.shape)
+            best_keys, best_rows = _merge_topk(np.hstack([best_keys, keys]),
+                                               np.hstack([best_rows, rows]), k)
+        all_keys.append(best_keys)
+        all_rows.append(best_rows)
+    keys, rows = np.vstack(all_keys), np.vstack(all_rows)
+
+    if metric == "L2":
+        distances = keys + (queries * queries).sum(axis=1)[:, None]
+    else:
+        distances = -keys
+    out_ids = np.asarray(ids)[rows] if ids is not None else rows
+    return out_ids, distances
+
+
+def result_ids(search_results):
+    """Primary keys per query from a MilvusClient.search() result."""
+    return [[hit["id"] for hit in hits] for hits in search_results]
+
+
+def recall_at_k(found, truth, k=None):
+    """Mean recall@k of found ids (one list per query) against ground-truth ids.
+
+    Queries with no ground truth (e.g. a filter that matches nothing) are skipped;
+    returns NaN if every query is skipped.
+    """
+    recalls = []
+    for f, t in zip(found, truth):
+        t = list(t)[:k] if k else list(t)
+        if not t:
+            continue
+        f = list(f)[:k] if k else list(f)
+        recalls.append(len(set(f) & set(t)) / len(t))
+    return float(np.mean(recalls)) if recalls else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute exact kNN ground truth for .npy vectors")
+    parser.add_argument("base", help="(n, dim) .npy base vectors, memory-mapped")
+    parser.add_argument("queries", help="(nq, dim) .npy query vectors")
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--metric", choices=METRICS, default="L2")
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS)
+    parser.add_argument("--out", default="ground_truth.npy", help="(nq, k) int64 neighbour row numbers")
+    args = parser.parse_args()
+
+    base, queries = open_vectors(args.base), np.load(args.queries)
+    truth, distances = exact_knn(base, queries, args.k, args.metric, block_rows=args.block_rows)
+    np.save(args.out, truth)
+    np.save(args.out.replace(".npy", "") + "_distances.npy", distances)
+    print(f"Ground truth for {len(queries)} queries over {base.shape[0]} vectors written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
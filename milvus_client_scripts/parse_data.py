@@ -1,94 +1,310 @@
+import base64
 import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-# Function to convert column-based data to row-based data
-def parse_column_based_data(column_data):
+import numpy as np
+
+# Fastest available JSON parser; all of them accept bytes and raise ValueError subclasses.
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import simdjson as _fast_json
+    except ImportError:
+        _fast_json = json
+
+DEFAULT_BATCH_ROWS = 10000
+DEFAULT_CHUNK_LINES = 16
+
+# Scalar type -> (key under "scalars", numpy dtype or None for Python objects)
+SCALAR_TYPES = {
+    "Bool": ("boolData", np.bool_),
+    "Int8": ("intData", np.int8),
+    "Int16": ("intData", np.int16),
+    "Int32": ("intData", np.int32),
+    "Int64": ("longData", np.int64),
+    "Float": ("floatData", np.float32),
+    "Double": ("doubleData", np.float64),
+    "String": ("stringData", None),
+    "VarChar": ("stringData", None),
+}
+
+# Dense vector type -> (key under "vectors", numpy dtype, base64-encoded, row width per dim).
+# Binary packs 8 dims per byte; bfloat16 has no numpy dtype and is kept as 2 raw bytes per dim.
+VECTOR_TYPES = {
+    "FloatVector": ("floatVector", np.float32, False, 1),
+    "BinaryVector": ("binaryVector", np.uint8, True, 1 / 8),
+    "Float16Vector": ("float16Vector", np.dtype("<f2"), True, 1),
+    "BFloat16Vector": ("bfloat16Vector", np.uint8, True, 2),
+    "Int8Vector": ("int8Vector", np.int8, True, 1),
+}
+
+SPARSE_ENTRY = np.dtype([("index", "<u4"), ("value", "<f4")])
+
+
+def _decode_scalar(scalars, field_type):
+    """Decode one ScalarField dict into a NumPy array (numeric) or list (string/JSON/array)."""
+    if field_type == "JSON":
+        return [json.loads(base64.b64decode(v)) for v in scalars.get("jsonData", {}).get("data", [])]
+    if field_type == "Array":
+        array_data = scalars.get("arrayData", {})
+        element_type = array_data.get("elementType", "VarChar")
+        return [_to_list(_decode_scalar(item, element_type)) for item in array_data.get("data", [])]
+    key, dtype = SCALAR_TYPES[field_type]
+    data = scalars.get(key, {}).get("data", [])
+    if dtype is None:
+        return list(data)
+    # int64 values are serialized as strings in protobuf JSON; numpy parses them in C.
+    return np.asarray(data, dtype=dtype)
+
+
+def _to_list(column):
+    return column.tolist() if isinstance(column, np.ndarray) else column
+
+
+def _decode_vector(vectors, field_type, num_rows):
+    """Decode a dense vector field into one (num_rows, width) array in a single reshape."""
+    key, dtype, encoded, per_dim = VECTOR_TYPES[field_type]
+    raw = vectors.get(key, {})
+    if encoded:
+        flat = np.frombuffer(base64.b64decode(raw or ""), dtype=dtype)
+    else:
+        flat = np.asarray(raw.get("data", []), dtype=dtype)
+
+    dim = int(vectors.get("dim", 0))
+    width = int(dim * per_dim) if dim else len(flat) // num_rows
+    expected = num_rows * width
+    if len(flat) < expected:
+        # Short payload: pad missing rows with zeros, as the row-based parser always did.
+        flat = np.concatenate([flat, np.zeros(expected - len(flat), dtype=dtype)])
+    return flat[:expected].reshape(num_rows, width)
+
+
+def _decode_sparse(vectors, num_rows):
+    contents = vectors.get("sparseFloatVector", {}).get("contents", [])
+    if not contents:
+        # BM25 output fields carry no data; Milvus regenerates them from the text field.
+        return [{} for _ in range(num_rows)]
+    rows = []
+    for blob in contents:
+        entries = np.frombuffer(base64.b64decode(blob), dtype=SPARSE_ENTRY)
+        rows.append(dict(zip(entries["index"].tolist(), entries["value"].tolist())))
+    return rows
+
+
+def _apply_valid_data(column, valid, num_rows):
+    """Expand a nullable column to num_rows, with None where validData is false."""
+    valid = np.asarray(valid, dtype=bool)
+    values = _to_list(column)
+    if len(values) == num_rows:
+        return [v if ok else None for v, ok in zip(values, valid)]
+    # Only valid values were serialized: scatter them into place.
+    out = [None] * num_rows
+    for pos, v in zip(np.flatnonzero(valid).tolist(), values):
+        out[pos] = v
+    return out
+
+
+def decode_columns(column_data):
     """
-    Convert column-based JSON data to row-based format.
-    
+    Decode the fieldsData of one insert payload into columns.
+
     Args:
         column_data: Dictionary containing fieldsData with column-based structure
-    
+
     Returns:
-        List of dictionaries, each representing a row
+        (num_rows, {field_name: column}) where numeric scalars are 1-D NumPy arrays,
+        dense vectors are 2-D NumPy arrays (one row per entity), and strings, JSON,
+        arrays, sparse vectors and nullable fields are Python lists.
     """
     fields_data = column_data.get("fieldsData", [])
-    if not fields_data:
-        return []
-    
-    # Get the number of rows from any field (they should all have the same numRows)
     num_rows = int(column_data.get("numRows", 0))
-    if num_rows == 0:
-        return []
-    
-    # Initialize list of row dictionaries
-    rows = [{} for _ in range(num_rows)]
-    
-    # Process each field
+    if not fields_data or num_rows == 0:
+        return 0, {}
+
+    columns = {}
     for field in fields_data:
         field_name = field.get("fieldName", "")
         field_type = field.get("type", "")
-        field_id = field.get("fieldId", "")
-        
-        if field_type == "VarChar":
-            # Handle VARCHAR fields
-            string_data = field.get("scalars", {}).get("stringData", {}).get("data", [])
-            for i, value in enumerate(string_data):
-                if i < num_rows:
-                    rows[i][field_name] = value
-                    
-        elif field_type == "Int64":
-            # Handle INT64 fields
-            long_data = field.get("scalars", {}).get("longData", {}).get("data", [])
-            for i, value in enumerate(long_data):
-                if i < num_rows:
-                    rows[i][field_name] = int(value)
-                    
-        elif field_type == "FloatVector":
-            # Handle FloatVector fields
-            vector_data = field.get("vectors", {}).get("floatVector", {}).get("data", [])
-            dim = int(field.get("vectors", {}).get("dim", 4096))
-            
-            # Split flat vector data into individual vectors
-            for i in range(num_rows):
-                start_idx = i * dim
-                end_idx = start_idx + dim
-                if end_idx <= len(vector_data):
-                    rows[i][field_name] = vector_data[start_idx:end_idx]
-                else:
-                    rows[i][field_name] = [0.0] * dim  # Default vector
-                    
-        elif field_type == "Array":
-            # Handle Array fields
-            array_data = field.get("scalars", {}).get("arrayData", {}).get("data", [])
-            for i, array_item in enumerate(array_data):
-                if i < num_rows:
-                    # Extract string data from array
-                    string_data = array_item.get("stringData", {}).get("data", [])
-                    rows[i][field_name] = string_data
-                    
+
+        if field_type in VECTOR_TYPES:
+            column = _decode_vector(field.get("vectors", {}), field_type, num_rows)
         elif field_type == "SparseFloatVector":
-            # Handle SparseFloatVector fields - will be generated by BM25 function
-            # Initialize as empty, will be populated by Milvus BM25 function
-            for i in range(num_rows):
-                rows[i][field_name] = {}
-    
-    return rows
+            column = _decode_sparse(field.get("vectors", {}), num_rows)
+        elif field_type in SCALAR_TYPES or field_type in ("JSON", "Array"):
+            column = _decode_scalar(field.get("scalars", {}), field_type)
+            if len(column) > num_rows:
+                column = column[:num_rows]
+        else:
+            print(f"Skipping field '{field_name}' with unsupported type '{field_type}'")
+            continue
 
-# Load and prepare data for insertion
-def load_data(file_path):
+        if field.get("validData"):
+            column = _apply_valid_data(column, field["validData"], num_rows)
+        columns[field_name] = column
+
+    return num_rows, columns
+
+
+def _row_values(column):
+    """Per-row values in the form pymilvus accepts for each column kind."""
+    if not isinstance(column, np.ndarray):
+        return column
+    if column.ndim == 1:
+        return column.tolist()
+    if column.dtype == np.uint8:
+        # Binary and bfloat16 vectors are passed as raw bytes per row.
+        return [row.tobytes() for row in column]
+    return list(column)
+
+
+# Function to convert column-based data to row-based data
+def parse_column_based_data(column_data):
+    """
+    Convert column-based JSON data to row-based format.
+
+    Args:
+        column_data: Dictionary containing fieldsData with column-based structure
+
+    Returns:
+        List of dictionaries, each representing a row
+    """
+    num_rows, columns = decode_columns(column_data)
+    if num_rows == 0:
+        return []
+
+    names = list(columns)
+    values = [_row_values(columns[n]) for n in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def parse_column_batch(column_data, skip_fields=()):
+    """
+    Convert one payload into a column-oriented insert batch.
+
+    Returns {field_name: column} with vectors as 2-D arrays, ready for
+    insert_column_batch(); fields in skip_fields (e.g. BM25 outputs, auto-id
+    primary keys) are dropped.
+    """
+    _, columns = decode_columns(column_data)
+    return {name: col for name, col in columns.items() if name not in skip_fields}
+
+
+def insert_column_batch(collection, batch):
+    """
+    Insert a batch from parse_column_batch() via ORM Collection.insert without
+    building row dicts. Columns are ordered by the collection schema; fields that
+    are auto-id or function outputs are omitted.
+    """
+    schema = collection.schema
+    function_outputs = {name for fn in getattr(schema, "functions", []) or []
+                        for name in fn.output_field_names}
     data = []
-    with open(file_path, 'r', encoding='utf-8') as f:
+    for field in schema.fields:
+        if field.auto_id or field.name in function_outputs or field.name not in batch:
+            continue
+        data.append(_row_values(batch[field.name]))
+    return collection.insert(data)
+
+
+def _iter_line_chunks(file_path, chunk_lines):
+    chunk = []
+    with open(file_path, 'rb') as f:
         for line in f:
             line = line.strip()
             if line:  # Skip empty lines
-                try:
-                    column_data = json.loads(line)
-                    # Convert column-based data to row-based
-                    row_data = parse_column_based_data(column_data)
-                    data.extend(row_data)
-                except json.JSONDecodeError as e:
-                    print(f"Error parsing JSON line: {e}")
-                    continue
-    
+                chunk.append(line)
+                if len(chunk) >= chunk_lines:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def _decode_chunk(lines, columnar):
+    """Worker: parse a chunk of JSONL payloads into row lists or column batches."""
+    out = []
+    for line in lines:
+        try:
+            column_data = _fast_json.loads(line)
+        except ValueError as e:
+            print(f"Error parsing JSON line: {e}")
+            continue
+        out.append(parse_column_batch(column_data) if columnar
+                   else parse_column_based_data(column_data))
+    return out
+
+
+def _ordered_results(chunks, columnar, workers):
+    """Decode chunks in a process pool, yielding results in input order.
+
+    At most 2 * workers chunks are in flight, so memory stays bounded no
+    matter how large the file is.
+    """
+    if workers == 0:
+        for chunk in chunks:
+            yield from _decode_chunk(chunk, columnar)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_decode_chunk, chunk, columnar))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def stream_batches(file_path, batch_rows=DEFAULT_BATCH_ROWS, columnar=False,
+                   workers=None, chunk_lines=DEFAULT_CHUNK_LINES):
+    """
+    Stream a JSONL dump of insert payloads with constant memory.
+
+    Args:
+        file_path: JSONL file, one column-based payload per line
+        batch_rows: row-dict batches are re-chunked to this size; None keeps
+            one batch per payload (the original insert boundaries)
+        columnar: yield one column batch (see parse_column_batch) per payload,
+            preserving the original batch boundaries, instead of row dicts
+        workers: decoding processes; None = one per core, 0 = decode in-process
+        chunk_lines: lines handed to a worker at a time
+
+    Yields:
+        Lists of at most batch_rows row dicts, or column batch dicts.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = _ordered_results(_iter_line_chunks(file_path, chunk_lines), columnar, workers)
+    if columnar or batch_rows is None:
+        yield from (batch for batch in results if batch)
+        return
+
+    pending = []
+    for rows in results:
+        pending.extend(rows)
+        while len(pending) >= batch_rows:
+            yield pending[:batch_rows]
+            pending = pending[batch_rows:]
+    if pending:
+        yield pending
+
+
+def stream_insert(client, collection_name, file_path, batch_rows=DEFAULT_BATCH_ROWS, workers=None):
+    """Replay a dump into a collection batch by batch. Returns the number of rows inserted."""
+    total = 0
+    for rows in stream_batches(file_path, batch_rows=batch_rows, workers=workers):
+        total += client.insert(collection_name=collection_name, data=rows)["insert_count"]
+    print(f"Inserted {total} records from {file_path} into '{collection_name}'")
+    return total
+
+
+# Load and prepare data for insertion
+def load_data(file_path, workers=None):
+    data = []
+    for rows in stream_batches(file_path, workers=workers):
+        data.extend(rows)
+
     print(f"Loaded {len(data)} records from {file_path}")
     return data
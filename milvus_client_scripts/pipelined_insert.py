@@ -0,0 +1,132 @@
+"""
+Producer/consumer insert pipeline.
+
+Producer threads build column-based batches (gen_batch(i) -> list of columns in
+schema order) into a bounded queue while consumer threads, each with its own
+connection, insert them. Generation of batch i+k therefore overlaps with the
+in-flight inserts of earlier batches, and the queue bound keeps memory flat.
+
+Usage from a script:
+  inserter = PipelinedInserter("http://localhost:19530", "my_coll", concurrency=8)
+  summary = inserter.run(gen_batch, num_batches)
+"""
+
+import itertools
+import queue
+import threading
+import time
+
+from pymilvus import Collection, connections
+
+from bench_util import LatencyStats
+
+_DONE = object()
+QUEUE_POLL_INTERVAL = 0.1
+
+
+class PipelinedInserter:
+    def __init__(self, uri, collection_name, concurrency=4, producers=1, queue_depth=None,
+                 progress_every=10):
+        self.uri = uri
+        self.collection_name = collection_name
+        self.concurrency = concurrency
+        self.producers = producers
+        self.queue_depth = queue_depth or 2 * concurrency
+        self.progress_every = progress_every
+
+    def _connect(self, idx):
+        alias = f"pipelined_insert_{idx}"
+        connections.connect(alias, uri=self.uri)
+        return Collection(self.collection_name, using=alias)
+
+    def run(self, gen_batch, num_batches):
+        """Generate and insert num_batches batches. Returns a LatencyStats summary dict.
+
+        If gen_batch raises or a consumer cannot connect, the pipeline stops and the
+        first such exception is re-raised here; failed inserts only count as errors.
+        """
+        stats = LatencyStats()
+        work = queue.Queue(maxsize=self.queue_depth)
+        counter = itertools.count()
+        counter_lock = threading.Lock()
+        gen_seconds = []
+        stop = threading.Event()
+        failures = []
+
+        def fail(where, e):
+            failures.append((where, e))
+            stop.set()
+
+        def put(item):
+            # Never block forever on a full queue once the consumers are gone.
+            while not stop.is_set():
+                try:
+                    work.put(item, timeout=QUEUE_POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce():
+            while not stop.is_set():
+                with counter_lock:
+                    i = next(counter)
+                if i >= num_batches:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    columns = gen_batch(i)
+                except Exception as e:
+                    fail(f"gen_batch({i})", e)
+                    return
+                gen_seconds.append(time.perf_counter() - t0)
+                put((i, columns))
+
+        def consume(idx):
+            try:
+                collection = self._connect(idx)
+            except Exception as e:
+                fail(f"consumer {idx} connect", e)
+                return
+            while not stop.is_set():
+                try:
+                    item = work.get(timeout=QUEUE_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    return
+                i, columns = item
+                rows = len(columns[0])
+                t0 = time.perf_counter()
+                try:
+                    collection.insert(columns)
+                except Exception as e:
+                    stats.error()
+                    print(f"insert batch {i} failed: {e}")
+                    continue
+                stats.record(time.perf_counter() - t0, rows)
+                done = len(stats.latencies)
+                if self.progress_every and done % self.progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done}/{num_batches} batches, {stats.rows / elapsed:.0f} rows/s")
+
+        start = time.perf_counter()
+        producers = [threading.Thread(target=produce, daemon=True) for _ in range(self.producers)]
+        consumers = [threading.Thread(target=consume, args=(i,), daemon=True)
+                     for i in range(self.concurrency)]
+        for t in producers + consumers:
+            t.start()
+        for t in producers:
+            t.join()
+        for _ in consumers:
+            put(_DONE)
+        for t in consumers:
+            t.join()
+
+        if failures:
+            where, e = failures[0]
+            print(f"pipelined insert stopped: {where} failed: {e}")
+            raise e
+
+        summary = stats.summary(time.perf_counter() - start)
+        summary["gen_ms_avg"] = 1000 * sum(gen_seconds) / len(gen_seconds) if gen_seconds else 0.0
+        return summary
@@ -1,38 +1,120 @@
+"""
+Release and reload collections, e.g. around a rolling restart.
+
+Collections are given by name or glob pattern (matched against
+utility.list_collections()). Up to --concurrency collections are handled at a
+time: each is released if loaded, then loaded asynchronously and polled via
+loading_progress until 100%. Reports per-collection release/load time and the
+overall wall-clock time.
+
+Usage:
+  python reload.py fouram_CaUszFZ8
+  python reload.py 'fouram_*' 'collection_1?' --concurrency 8 --replicas 2 --uri http://10.104.26.93:19530
+"""
+
+import argparse
+import fnmatch
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from pymilvus import connections, utility, Collection
+from pymilvus.client.types import LoadState
+
+from bench_util import print_table
+
+LOAD_POLL_INTERVAL = 0.5
+DEFAULT_LOAD_TIMEOUT = 3600
 
 
 # Release collection from memory
 def release_collection(collection_name):
     if not utility.has_collection(collection_name):
         print(f"Collection '{collection_name}' does not exist.")
-        return
-    
-    utility.load_state(collection_name)
-    if utility.load_state(collection_name):
-        collection = Collection(collection_name)
-        collection.release()
-        print(f"Collection '{collection_name}' released from memory.")
-    else:
+        return False
+
+    if utility.load_state(collection_name) == LoadState.NotLoad:
         print(f"Collection '{collection_name}' is not loaded in memory.")
+        return False
+    Collection(collection_name).release()
+    print(f"Collection '{collection_name}' released from memory.")
+    return True
 
-def load_collection(collection_name):
+
+def load_collection(collection_name, replica_number=1, timeout=DEFAULT_LOAD_TIMEOUT):
+    """Start loading and wait on loading_progress. Returns seconds until 100%."""
     if not utility.has_collection(collection_name):
         print(f"Collection '{collection_name}' does not exist.")
-        return
-    
-    utility.load_state(collection_name)
-    collection = Collection(collection_name)
-    collection.load()
-    print(f"Collection '{collection_name}' loaded into memory.")
+        return None
+
+    start = time.perf_counter()
+    progress = "0%"
+    Collection(collection_name).load(replica_number=replica_number, _async=True)
+    while time.perf_counter() - start < timeout:
+        progress = utility.loading_progress(collection_name)["loading_progress"]
+        if int(str(progress).rstrip("%")) >= 100:
+            elapsed = time.perf_counter() - start
+            print(f"Collection '{collection_name}' loaded into memory in {elapsed:.1f}s.")
+            return elapsed
+        time.sleep(LOAD_POLL_INTERVAL)
+    raise TimeoutError(f"Collection '{collection_name}' not loaded within {timeout}s (at {progress})")
+
+
+def resolve_collections(patterns):
+    """Expand names/glob patterns against the existing collections, keeping order."""
+    existing = utility.list_collections()
+    names = []
+    for pattern in patterns:
+        matched = fnmatch.filter(existing, pattern)
+        if not matched:
+            print(f"No collection matches '{pattern}'.")
+        names.extend(n for n in matched if n not in names)
+    return names
+
+
+def reload_collections(names, concurrency=4, replica_number=1, release=True,
+                       timeout=DEFAULT_LOAD_TIMEOUT):
+    """Release and reload `names` with at most `concurrency` in flight. Returns per-collection results."""
+    def reload(name):
+        result = {"collection": name, "released": False, "release_s": 0.0, "load_s": None, "error": ""}
+        try:
+            if release:
+                t0 = time.perf_counter()
+                result["released"] = release_collection(name)
+                result["release_s"] = time.perf_counter() - t0
+            result["load_s"] = load_collection(name, replica_number, timeout)
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"Collection '{name}' failed: {e}")
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(reload, names))
+    elapsed = time.perf_counter() - start
+
+    loaded = [r for r in results if r["load_s"] is not None]
+    print(f"\nReloaded {len(loaded)}/{len(names)} collections in {elapsed:.1f}s "
+          f"(concurrency={concurrency})")
+    print_table(sorted(results, key=lambda r: -(r["load_s"] or 0)))
+    return results
+
 
 # Example usage
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("collections", nargs="+", help="collection names or glob patterns")
+    parser.add_argument("--uri", default="http://localhost:19530")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--replicas", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_LOAD_TIMEOUT, help="per-collection load timeout")
+    parser.add_argument("--no-release", action="store_true", help="only load, do not release first")
+    args = parser.parse_args()
+
     # Connect to Milvus server
-    connections.connect("default", host="10.104.26.93", port="19530")
+    connections.connect("default", uri=args.uri)
 
-    COLLECTION_NAME = "fouram_CaUszFZ8"  # Replace with your collection name
-    release_collection(COLLECTION_NAME)
-    load_collection(COLLECTION_NAME)
+    reload_collections(resolve_collections(args.collections), concurrency=args.concurrency,
+                       replica_number=args.replicas, release=not args.no_release, timeout=args.timeout)
 
     # Disconnect from Milvus server
     connections.disconnect("default")
@@ -0,0 +1,115 @@
+"""
+Replay captured insert payloads (JSONL of fieldsData dumps) into a collection.
+
+Each captured payload is inserted as one request, so the original batch
+boundaries are preserved. Requests are paced to --rate rows/s (0 = as fast as
+possible) and at most --concurrency are in flight, each worker thread using its
+own client. Prints per-request latency percentiles and achieved throughput.
+
+Usage:
+  python replay.py dump.jsonl my_collection --rate 20000 --concurrency 4
+  python replay.py dump.jsonl my_collection --columnar --uri http://10.0.0.1:19530
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymilvus import MilvusClient, Collection, connections
+
+from bench_util import LatencyStats, RatePacer, print_table
+from parse_data import stream_batches, insert_column_batch
+
+_local = threading.local()
+
+
+def _batch_rows(batch, columnar):
+    if not columnar:
+        return len(batch)
+    return max(len(col) for col in batch.values())
+
+
+def _insert(args, batch, columnar):
+    """Insert one batch with this thread's own connection."""
+    if columnar:
+        if not hasattr(_local, "collection"):
+            alias = f"replay_{threading.get_ident()}"
+            connections.connect(alias, uri=args.uri)
+            _local.collection = Collection(args.collection, using=alias)
+        insert_column_batch(_local.collection, batch)
+    else:
+        if not hasattr(_local, "client"):
+            _local.client = MilvusClient(uri=args.uri)
+        _local.client.insert(collection_name=args.collection, data=batch)
+
+
+def _function_outputs(args):
+    """Fields filled by collection functions (e.g. BM25 sparse); inserts must not carry them."""
+    client = MilvusClient(uri=args.uri)
+    desc = client.describe_collection(args.collection)
+    client.close()
+    return {name for fn in desc.get("functions", []) for name in fn.get("output_field_names", [])}
+
+
+def replay(args):
+    stats = LatencyStats()
+    # Column batches are filtered by insert_column_batch; row dicts carry the {} placeholders.
+    skip = set() if args.columnar else _function_outputs(args)
+    pacer = RatePacer(args.rate)
+    # Bounds in-flight batches so decoding never runs far ahead of the server.
+    slots = threading.BoundedSemaphore(args.concurrency)
+
+    def run(batch, rows):
+        try:
+            if skip:
+                batch = [{k: v for k, v in row.items() if k not in skip} for row in batch]
+            start = time.perf_counter()
+            _insert(args, batch, args.columnar)
+            stats.record(time.perf_counter() - start, rows)
+        except Exception as e:
+            stats.error()
+            print(f"insert failed: {e}")
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    batches = stream_batches(args.file, batch_rows=None, columnar=args.columnar,
+                             workers=args.decode_workers)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i, batch in enumerate(batches):
+            if args.max_batches and i >= args.max_batches:
+                break
+            rows = _batch_rows(batch, args.columnar)
+            pacer.acquire(rows)
+            slots.acquire()
+            pool.submit(run, batch, rows)
+            if args.progress and (i + 1) % args.progress == 0:
+                elapsed = time.perf_counter() - start
+                print(f"  {i + 1} batches, {stats.rows} rows, {stats.rows / elapsed:.0f} rows/s")
+    return stats.summary(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file")
+    parser.add_argument("collection")
+    parser.add_argument("--uri", default="http://localhost:19530")
+    parser.add_argument("--rate", type=float, default=0, help="target rows/s, 0 = unlimited")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--columnar", action="store_true",
+                        help="insert column batches via ORM instead of row dicts")
+    parser.add_argument("--decode-workers", type=int, default=None,
+                        help="JSON decoding processes (default: one per core)")
+    parser.add_argument("--max-batches", type=int, default=0)
+    parser.add_argument("--progress", type=int, default=100, help="print every N batches, 0 = off")
+    args = parser.parse_args()
+
+    summary = replay(args)
+    summary["target_rows_per_s"] = args.rate or "max"
+    print()
+    print_table([summary])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Content-addressed cache for generated import datasets.
+
+A dataset is identified by (schema, id range, seed, dim). Its Parquet file is
+generated once into DATASET_CACHE_DIR and uploaded once to
+s3://<bucket>/<root>/dataset_cache/[<namespace>/]<key>.parquet. Later rounds
+(and, without a namespace, later runs) reuse the object after a HEAD request
+confirms its ETag still matches the MD5 of the local file, so a wiped MinIO
+volume is detected and re-filled. A per-run namespace keeps each run's objects
+separate while rounds within the run still share them.
+
+Shared by test_import_commit_ts/ and test_cdc/import/, which put this
+directory on sys.path.
+
+Vectors are drawn from an RNG seeded by the key itself, so the same key always
+produces byte-identical data regardless of call order.
+"""
+
+import hashlib
+import json
+import os
+
+import boto3
+import numpy as np
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+DATASET_CACHE_DIR = os.path.expanduser(
+    os.getenv("DATASET_CACHE_DIR", "~/.cache/milvus_import_datasets"))
+MANIFEST_FILE = "manifest.json"
+
+
+def id_spec(num_rows=0, start_id=0, step=1, ids=None):
+    """Describe the id column for dataset_key().
+
+    Sequential ranges are described by (start, num, step); explicit id lists
+    are reduced to a digest so the key stays short.
+    """
+    if ids is not None:
+        ids = [int(i) for i in ids]
+        digest = hashlib.sha256(json.dumps(ids).encode()).hexdigest()
+        return {"ids_sha256": digest, "num": len(ids)}
+    return {"start": start_id, "num": num_rows, "step": step}
+
+
+def dataset_key(schema, ids, seed, dim, extra=None):
+    """Return the hex key for a dataset.
+
+    Args:
+        schema: list of (field_name, arrow_type_str) pairs, in column order.
+        ids: output of id_spec().
+        seed: base RNG seed.
+        dim: vector dimension.
+        extra: any other JSON-serializable input that changes the content
+            (e.g. explicit varchar values).
+    """
+    payload = json.dumps({
+        "schema": [list(f) for f in schema],
+        "ids": ids,
+        "seed": seed,
+        "dim": dim,
+        "extra": extra,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _file_md5(path):
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DatasetCache:
+    """Local Parquet store plus a manifest of objects known to be in the bucket."""
+
+    def __init__(self, endpoint, access_key, secret_key, bucket, root_path,
+                 cache_dir=DATASET_CACHE_DIR, namespace=None):
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.bucket = bucket
+        self.root_path = root_path
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+        self.hits = 0
+        self.uploads = 0
+        self._s3 = None
+        os.makedirs(cache_dir, exist_ok=True)
+        self._manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+        self._manifest = self._load_manifest()
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            self._s3 = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint,
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key,
+            )
+        return self._s3
+
+    @staticmethod
+    def rng(key):
+        """Deterministic RNG for a dataset key."""
+        return np.random.default_rng(int(key[:16], 16))
+
+    def remote_key(self, key):
+        if self.namespace:
+            return f"{self.root_path}/dataset_cache/{self.namespace}/{key}.parquet"
+        return f"{self.root_path}/dataset_cache/{key}.parquet"
+
+    def local_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key, build_table):
+        """Return (remote_key, reused) for the dataset, building/uploading if needed.
+
+        build_table(rng) must return a pyarrow.Table; it is only called when the
+        Parquet file is not already cached locally.
+        """
+        local = self.local_path(key)
+        if not os.path.exists(local):
+            table = build_table(self.rng(key))
+            tmp = f"{local}.{os.getpid()}.tmp"
+            pq.write_table(table, tmp)
+            os.replace(tmp, local)
+
+        md5 = _file_md5(local)
+        remote = self.remote_key(key)
+        manifest_id = f"{self.endpoint}/{self.bucket}/{remote}"
+
+        if self._manifest.get(manifest_id) == md5 and self._remote_etag(remote) == md5:
+            self.hits += 1
+            return remote, True
+
+        with open(local, "rb") as f:
+            # Single-part put so the ETag is the plain MD5 of the body.
+            resp = self.s3.put_object(Bucket=self.bucket, Key=remote, Body=f)
+        etag = resp["ETag"].strip('"')
+        if etag != md5:
+            raise RuntimeError(f"ETag mismatch after upload of {remote}: {etag} != {md5}")
+        self._manifest[manifest_id] = md5
+        self._save_manifest()
+        self.uploads += 1
+        return remote, False
+
+    def _remote_etag(self, remote):
+        try:
+            head = self.s3.head_object(Bucket=self.bucket, Key=remote)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ETag"].strip('"')
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self):
+        tmp = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._manifest_path)
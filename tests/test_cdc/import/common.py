@@ -14,16 +14,18 @@ the proxy multiplexes HTTP on the gRPC port. Override via env vars if
 the cluster was started with an explicit PROXY_HTTP_PORT.
 """
 import os
-import tempfile
+import sys
 import time
 
-import boto3
 import numpy as np
 import pyarrow as pa
-import pyarrow.parquet as pq
 import requests
 from loguru import logger
 
+# Content-addressed dataset cache shared with test_import_commit_ts/.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from dataset_cache import DatasetCache, dataset_key, id_spec  # noqa: E402
+
 # --- REST / MinIO config ---
 CLUSTER_A_REST_URI = os.getenv("CLUSTER_A_REST_URI", "http://localhost:18530")
 CLUSTER_B_REST_URI = os.getenv("CLUSTER_B_REST_URI", "http://localhost:18531")
@@ -37,6 +39,11 @@ MILVUS_ROOT_PATH = os.getenv("MILVUS_ROOT_PATH", "files")
 # --- Schema ---
 DIM = 4
 RNG = np.random.default_rng(seed=42)
+DATASET_SEED = 42
+PARQUET_SCHEMA = [("id", "int64"), ("vector", "list<float32>")]
+_DATASET_CACHE = None
+# Per-run object namespace, so runs never share import files (rounds within a run do).
+RUN_ID = int(time.time() * 1000)
 
 
 # ---------- REST helpers ----------
@@ -106,52 +113,55 @@ def wait_for_import_done_on_a(job_id, timeout=180):
 
 # ---------- Parquet generator ----------
 
+def _dataset_cache():
+    global _DATASET_CACHE
+    if _DATASET_CACHE is None:
+        _DATASET_CACHE = DatasetCache(
+            MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY,
+            MINIO_BUCKET, MILVUS_ROOT_PATH, namespace=f"cdc_import_{RUN_ID}")
+    return _DATASET_CACHE
+
+
 def generate_and_upload_parquet(num_rows, start_id=0, prefix="import",
-                                step=1, ids=None):
+                                step=1, ids=None, seed=DATASET_SEED):
     """Generate parquet with columns (id int64, vector list<float32>) and
     upload to MinIO. Returns the remote key (path inside the bucket).
 
+    The object is content-addressed by (schema, ids, seed, dim) under a
+    per-run namespace: every run uploads its own objects, as before, while
+    rounds of one run that import the same id range reuse the file and
+    upload. Vectors are deterministic per id range; these tests check ids
+    and row counts across clusters, not vector values.
+
     Args:
         num_rows: number of rows (ignored if ids provided).
         start_id: starting ID for sequential generation.
-        prefix: S3 path prefix under MILVUS_ROOT_PATH.
+        prefix: label for log output only.
         step: ID step for sequential generation (e.g. step=2 -> evens only).
         ids: explicit list of IDs; overrides num_rows/start_id/step.
+        seed: base seed for vector generation.
     """
     if ids is not None:
         ids = list(ids)
         num_rows = len(ids)
+        spec = id_spec(ids=ids)
     else:
+        spec = id_spec(num_rows, start_id, step)
         ids = list(range(start_id, start_id + num_rows * step, step))
 
-    vectors = RNG.random((num_rows, DIM), dtype=np.float32)
-    vec_arrays = [vectors[i].tolist() for i in range(num_rows)]
+    key = dataset_key(PARQUET_SCHEMA, spec, seed, DIM)
 
-    table = pa.table({
-        "id": pa.array(ids, type=pa.int64()),
-        "vector": pa.array(vec_arrays, type=pa.list_(pa.float32())),
-    })
-
-    with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
-        pq.write_table(table, f.name)
-        local_path = f.name
-
-    # Suffix with timestamp to avoid object collisions across test runs
-    suffix = int(time.time() * 1000)
-    remote_key = f"{MILVUS_ROOT_PATH}/{prefix}_{start_id}_{num_rows}_{suffix}.parquet"
-
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=MINIO_ENDPOINT,
-        aws_access_key_id=MINIO_ACCESS_KEY,
-        aws_secret_access_key=MINIO_SECRET_KEY,
-    )
-    try:
-        s3.upload_file(local_path, MINIO_BUCKET, remote_key)
-    finally:
-        os.unlink(local_path)
+    def build(rng):
+        vectors = rng.random((num_rows, DIM), dtype=np.float32)
+        offsets = np.arange(0, (num_rows + 1) * DIM, DIM, dtype=np.int32)
+        return pa.table({
+            "id": pa.array(ids, type=pa.int64()),
+            "vector": pa.ListArray.from_arrays(pa.array(offsets), pa.array(vectors.ravel())),
+        })
 
-    logger.info(f"Uploaded parquet to s3://{MINIO_BUCKET}/{remote_key} ({num_rows} rows)")
+    remote_key, reused = _dataset_cache().get(key, build)
+    action = "Reused" if reused else "Uploaded"
+    logger.info(f"{action} parquet s3://{MINIO_BUCKET}/{remote_key} ({prefix}, {num_rows} rows)")
     return remote_key
 
 
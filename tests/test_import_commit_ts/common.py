@@ -5,15 +5,16 @@ Uses MilvusClient API (not deprecated ORM).
 
 import time
 import os
-import tempfile
+import sys
 
 import numpy as np
 import pyarrow as pa
-import pyarrow.parquet as pq
-import boto3
 import requests
 from pymilvus import MilvusClient, DataType
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from dataset_cache import DatasetCache, dataset_key, id_spec  # noqa: E402
+
 MILVUS_URI = os.getenv("MILVUS_URI", "http://localhost:19530")
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
@@ -23,6 +24,11 @@ MILVUS_ROOT_PATH = os.getenv("MILVUS_ROOT_PATH", "files")
 
 DIM = 128
 RNG = np.random.default_rng(seed=42)
+DATASET_SEED = 42
+
+PARQUET_SCHEMA = [("id", "int64"), ("vec", "list<float32>"), ("varchar", "string")]
+PARQUET_SCHEMA_AUTO_ID = [("vec", "list<float32>"), ("varchar", "string")]
+_DATASET_CACHE = None
 
 
 def get_client():
@@ -111,86 +117,79 @@ def insert_rows_auto_id(client, collection_name, num_rows,
     return result["ids"]
 
 
+def _dataset_cache():
+    global _DATASET_CACHE
+    if _DATASET_CACHE is None:
+        _DATASET_CACHE = DatasetCache(MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY,
+                                      MINIO_BUCKET, MILVUS_ROOT_PATH)
+    return _DATASET_CACHE
+
+
+def _vector_array(rng, num_rows):
+    vectors = rng.random((num_rows, DIM), dtype=np.float32)
+    offsets = np.arange(0, (num_rows + 1) * DIM, DIM, dtype=np.int32)
+    return pa.ListArray.from_arrays(pa.array(offsets), pa.array(vectors.ravel()))
+
+
 def generate_and_upload_parquet(num_rows, start_id=0, prefix="import_test",
-                               step=1, ids=None, varchar_values=None):
+                               step=1, ids=None, varchar_values=None, seed=DATASET_SEED):
     """Generate parquet file and upload to minio. Returns the remote path.
 
+    The file is content-addressed by (schema, ids, seed, dim): identical
+    requests reuse the locally cached file and the already-uploaded object.
+
     Args:
         num_rows: Number of rows (ignored when ids is provided).
         start_id: Starting ID for sequential generation.
-        prefix: S3 path prefix.
+        prefix: Label for log output only; the remote key is the content key.
         step: Step between consecutive IDs (e.g. step=2 -> 0,2,4,...).
         ids: Explicit list of IDs to use. Overrides num_rows/start_id/step.
         varchar_values: Explicit list of varchar values. Must match row count.
+        seed: Base seed for vector generation.
     """
     if ids is not None:
         ids = list(ids)
         num_rows = len(ids)
+        spec = id_spec(ids=ids)
     else:
+        spec = id_spec(num_rows, start_id, step)
         ids = list(range(start_id, start_id + num_rows * step, step))
 
-    vectors = RNG.random((num_rows, DIM), dtype=np.float32)
+    varchars = list(varchar_values) if varchar_values is not None else None
+    key = dataset_key(PARQUET_SCHEMA, spec, seed, DIM, extra={"varchar": varchars})
 
-    if varchar_values is not None:
-        varchars = list(varchar_values)
-    else:
-        varchars = [f"row_{i}" for i in ids]
-
-    vec_arrays = [vectors[i].tolist() for i in range(num_rows)]
-    table = pa.table({
-        "id": pa.array(ids, type=pa.int64()),
-        "vec": pa.array(vec_arrays, type=pa.list_(pa.float32())),
-        "varchar": pa.array(varchars, type=pa.string()),
-    })
-
-    with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
-        pq.write_table(table, f.name)
-        local_path = f.name
-
-    remote_key = f"{MILVUS_ROOT_PATH}/{prefix}_{start_id}_{num_rows}.parquet"
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=MINIO_ENDPOINT,
-        aws_access_key_id=MINIO_ACCESS_KEY,
-        aws_secret_access_key=MINIO_SECRET_KEY,
-    )
-    s3.upload_file(local_path, MINIO_BUCKET, remote_key)
-    os.unlink(local_path)
+    def build(rng):
+        return pa.table({
+            "id": pa.array(ids, type=pa.int64()),
+            "vec": _vector_array(rng, num_rows),
+            "varchar": pa.array(varchars or [f"row_{i}" for i in ids], type=pa.string()),
+        })
 
-    print(f"Uploaded parquet to s3://{MINIO_BUCKET}/{remote_key} ({num_rows} rows)")
+    remote_key, reused = _dataset_cache().get(key, build)
+    action = "Reused" if reused else "Uploaded"
+    print(f"{action} parquet s3://{MINIO_BUCKET}/{remote_key} ({prefix}, {num_rows} rows)")
     return remote_key
 
 
 def generate_and_upload_parquet_auto_id(num_rows, varchar_prefix="import",
-                                        prefix="import_auto"):
+                                        prefix="import_auto", seed=DATASET_SEED):
     """Generate parquet WITHOUT id field (for auto-ID collections) and upload.
 
-    Returns the remote S3 path.
+    Content-addressed like generate_and_upload_parquet. Returns the remote S3 path.
     """
-    vectors = RNG.random((num_rows, DIM), dtype=np.float32)
-    varchars = [f"{varchar_prefix}_{i}" for i in range(num_rows)]
-
-    vec_arrays = [vectors[i].tolist() for i in range(num_rows)]
-    table = pa.table({
-        "vec": pa.array(vec_arrays, type=pa.list_(pa.float32())),
-        "varchar": pa.array(varchars, type=pa.string()),
-    })
-
-    with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
-        pq.write_table(table, f.name)
-        local_path = f.name
-
-    remote_key = f"{MILVUS_ROOT_PATH}/{prefix}_{num_rows}.parquet"
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=MINIO_ENDPOINT,
-        aws_access_key_id=MINIO_ACCESS_KEY,
-        aws_secret_access_key=MINIO_SECRET_KEY,
-    )
-    s3.upload_file(local_path, MINIO_BUCKET, remote_key)
-    os.unlink(local_path)
-
-    print(f"Uploaded auto-id parquet to s3://{MINIO_BUCKET}/{remote_key} ({num_rows} rows)")
+    key = dataset_key(PARQUET_SCHEMA_AUTO_ID, id_spec(num_rows), seed, DIM,
+                      extra={"varchar_prefix": varchar_prefix})
+
+    def build(rng):
+        return pa.table({
+            "vec": _vector_array(rng, num_rows),
+            "varchar": pa.array([f"{varchar_prefix}_{i}" for i in range(num_rows)],
+                                type=pa.string()),
+        })
+
+    remote_key, reused = _dataset_cache().get(key, build)
+    action = "Reused" if reused else "Uploaded"
+    print(f"{action} auto-id parquet s3://{MINIO_BUCKET}/{remote_key} ({prefix}, {num_rows} rows)")
     return remote_key
 
 
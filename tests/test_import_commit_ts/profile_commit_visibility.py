@@ -0,0 +1,140 @@
+"""
+Profiler: commit-to-visible latency for import 2PC.
+
+Measures, from the moment import_commit() returns, how long it takes until:
+  - the job reports Completed (commit_done), and
+  - count(*) at the given consistency level returns all imported rows (visible).
+
+Two modes per (size, consistency level):
+  - live:   collection stays loaded; poll query until rows appear.
+  - reload: wait for Completed, release + load, then poll (what the tests do).
+            load_s is reported separately; visible includes it.
+
+A trial that never becomes visible within --timeout is reported as a timeout
+instead of failing the whole run.
+
+Usage:
+  python profile_commit_visibility.py
+  python profile_commit_visibility.py --sizes 500,50000 --levels Strong,Bounded --modes live --trials 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import (
+    get_client, create_collection, create_index_and_load,
+    generate_and_upload_parquet,
+    import_create, import_commit, import_get_progress, wait_for_import_state,
+)
+
+COLLECTION = "profile_commit_visibility"
+POLL_INTERVAL = 0.05
+
+
+def _count(client, level):
+    results = client.query(collection_name=COLLECTION, filter="id >= 0",
+                           output_fields=["count(*)"], consistency_level=level)
+    return results[0]["count(*)"]
+
+
+def _poll(predicate, timeout):
+    """Return seconds until predicate() is truthy, or None on timeout."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if predicate():
+            return time.perf_counter() - start
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def run_trial(client, num_rows, level, mode, trial, timeout):
+    """One import -> commit -> visible cycle on a fresh collection."""
+    create_collection(client, COLLECTION)
+    create_index_and_load(client, COLLECTION)
+
+    # Distinct seed per trial so every trial imports fresh data but stays cacheable.
+    remote_path = generate_and_upload_parquet(num_rows, start_id=0, prefix="profile_vis", seed=trial)
+    job_id = import_create(COLLECTION, files=[[remote_path]], auto_commit=False)
+    wait_for_import_state(job_id, "Uncommitted", timeout=timeout)
+    assert _count(client, level) == 0, "rows visible before commit"
+
+    import_commit(job_id)
+    committed_at = time.perf_counter()
+
+    result = {"rows": num_rows, "level": level, "mode": mode,
+              "commit_done_s": None, "load_s": None, "visible_s": None}
+
+    def since_commit():
+        return time.perf_counter() - committed_at
+
+    if mode == "live":
+        def check():
+            if result["commit_done_s"] is None and import_get_progress(job_id)[0] == "Completed":
+                result["commit_done_s"] = since_commit()
+            if result["visible_s"] is None and _count(client, level) == num_rows:
+                result["visible_s"] = since_commit()
+            return result["commit_done_s"] is not None and result["visible_s"] is not None
+        _poll(check, timeout)
+    elif _poll(lambda: import_get_progress(job_id)[0] == "Completed", timeout) is not None:
+        result["commit_done_s"] = since_commit()
+        load_start = time.perf_counter()
+        client.release_collection(COLLECTION)
+        client.load_collection(COLLECTION)
+        result["load_s"] = time.perf_counter() - load_start
+        if _poll(lambda: _count(client, level) == num_rows, timeout) is not None:
+            result["visible_s"] = since_commit()
+
+    client.drop_collection(COLLECTION)
+    return result
+
+
+def _fmt_ms(values):
+    vals = [v for v in values if v is not None]
+    if not vals:
+        return "-"
+    p50, p95, mx = np.percentile(vals, [50, 95, 100]) * 1000
+    return f"p50={p50:.0f} p95={p95:.0f} max={mx:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500,10000,100000")
+    parser.add_argument("--levels", default="Strong,Bounded,Session,Eventually")
+    parser.add_argument("--modes", default="live,reload")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    levels = args.levels.split(",")
+    modes = args.modes.split(",")
+
+    client = get_client()
+    results = []
+    for num_rows in sizes:
+        for level in levels:
+            for mode in modes:
+                for trial in range(args.trials):
+                    r = run_trial(client, num_rows, level, mode, trial, args.timeout)
+                    results.append(r)
+                    vis = "timeout" if r["visible_s"] is None else f"{r['visible_s'] * 1000:.0f}ms"
+                    print(f"  rows={num_rows} level={level} mode={mode} trial={trial}: visible={vis}")
+
+    print("\n========== COMMIT-TO-VISIBLE LATENCY (ms) ==========")
+    print(f"{'rows':>8} {'level':<11} {'mode':<7} {'timeouts':>8}  visible / commit_done / load")
+    for num_rows in sizes:
+        for level in levels:
+            for mode in modes:
+                group = [r for r in results
+                         if r["rows"] == num_rows and r["level"] == level and r["mode"] == mode]
+                timeouts = sum(1 for r in group if r["visible_s"] is None)
+                print(f"{num_rows:>8} {level:<11} {mode:<7} {timeouts:>8}  "
+                      f"{_fmt_ms([r['visible_s'] for r in group])} / "
+                      f"{_fmt_ms([r['commit_done_s'] for r in group])} / "
+                      f"{_fmt_ms([r['load_s'] for r in group])}")
+
+
+if __name__ == "__main__":
+    main()
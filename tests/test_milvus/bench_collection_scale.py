@@ -0,0 +1,163 @@
+"""
+Many-collection scale test: create, index, load, release and drop thousands of
+collections with bounded parallelism, replacing the serial loops of
+multiple_collection.py and milvus_client_scripts/create.py.
+
+Every DDL call is timed. Latencies are grouped by how far the phase has
+progressed (n = calls already issued in that phase, so for create it is the
+number of collections that already exist, for load the number already
+loaded), which gives the coordinator degradation curve: p50/p95/p99 latency vs
+collection count. Curves are printed per phase with an ASCII bar of p99,
+optionally appended to CSV and, if matplotlib is installed, plotted to PNG.
+
+Usage:
+  python bench_collection_scale.py --collections 2000 --concurrency 16
+  python bench_collection_scale.py --phases create,index --keep --bucket 250 --csv scale.csv --plot scale.png
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymilvus import MilvusClient, DataType
+
+from bench_common import MILVUS_URI, percentiles, print_table, write_csv
+
+# Optional: only needed for --plot.
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+PHASES = ("create", "index", "load", "release", "drop")
+BAR_WIDTH = 40
+
+
+def _create(client, name, dim):
+    schema = client.create_schema(auto_id=False)
+    schema.add_field("id", DataType.INT64, is_primary=True)
+    schema.add_field("vector", DataType.FLOAT_VECTOR, dim=dim)
+    # No index_params: create_collection would otherwise also index and load.
+    client.create_collection(name, schema=schema, consistency_level="Strong")
+
+
+def _index(client, name, dim):
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name="vector", index_type="AUTOINDEX", metric_type="L2")
+    client.create_index(name, index_params)
+
+
+OPS = {
+    "create": _create,
+    "index": _index,
+    "load": lambda client, name, dim: client.load_collection(name),
+    "release": lambda client, name, dim: client.release_collection(name),
+    "drop": lambda client, name, dim: client.drop_collection(name),
+}
+
+
+def run_phase(uri, phase, names, dim, concurrency):
+    """Run one DDL per collection with at most `concurrency` in flight.
+
+    Returns [(position, seconds or None on error)] in issue order.
+    """
+    local = threading.local()
+    errors = []
+
+    def op(item):
+        pos, name = item
+        if not hasattr(local, "client"):
+            local.client = MilvusClient(uri=uri)
+        t0 = time.perf_counter()
+        try:
+            OPS[phase](local.client, name, dim)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            return pos, None
+        return pos, time.perf_counter() - t0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(op, enumerate(names)))
+    elapsed = time.perf_counter() - start
+    print(f"{phase}: {len(names)} collections in {elapsed:.1f}s "
+          f"({len(names) / elapsed:.1f} ops/s), {len(errors)} errors")
+    for e in errors[:5]:
+        print(f"  {e}")
+    return results
+
+
+def degradation_curve(phase, results, bucket):
+    """Latency percentiles (ms) per bucket of `bucket` consecutive calls."""
+    groups = {}
+    for pos, seconds in results:
+        groups.setdefault(pos // bucket * bucket, []).append(seconds)
+    curve = []
+    for n in sorted(groups):
+        ok = [s * 1000 for s in groups[n] if s is not None]
+        p = percentiles(ok)
+        curve.append({"phase": phase, "n": n, "ops": len(groups[n]), "errors": len(groups[n]) - len(ok),
+                      "p50_ms": p["p50"], "p95_ms": p["p95"], "p99_ms": p["p99"]})
+    return curve
+
+
+def print_curve(curve):
+    print_table(curve)
+    peak = max((r["p99_ms"] for r in curve if r["p99_ms"] == r["p99_ms"]), default=0)
+    for r in curve:
+        width = int(BAR_WIDTH * r["p99_ms"] / peak) if peak and r["p99_ms"] == r["p99_ms"] else 0
+        print(f"  n={r['n']:>6} {'#' * width}")
+
+
+def plot_curves(curves, path):
+    if plt is None:
+        print("matplotlib is not installed, skipping --plot")
+        return
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for phase, curve in curves.items():
+        ax.plot([r["n"] for r in curve], [r["p99_ms"] for r in curve], marker=".", label=f"{phase} p99")
+        ax.plot([r["n"] for r in curve], [r["p50_ms"] for r in curve], linestyle="--", label=f"{phase} p50")
+    ax.set_xlabel("collections already processed in phase")
+    ax.set_ylabel("latency (ms)")
+    ax.set_yscale("log")
+    ax.legend()
+    fig.savefig(path)
+    print(f"Plot written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--collections", type=int, default=1000)
+    parser.add_argument("--prefix", default="scale_collection")
+    parser.add_argument("--dim", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--phases", default=",".join(PHASES))
+    parser.add_argument("--bucket", type=int, default=100, help="calls per point on the curve")
+    parser.add_argument("--keep", action="store_true", help="never drop, even if 'drop' is in --phases")
+    parser.add_argument("--csv", default=None, help="append curves to this CSV file")
+    parser.add_argument("--plot", default=None, help="write a latency-vs-count PNG (needs matplotlib)")
+    args = parser.parse_args()
+
+    phases = [p for p in args.phases.split(",") if not (args.keep and p == "drop")]
+    names = [f"{args.prefix}_{i}" for i in range(args.collections)]
+
+    curves = {}
+    for phase in phases:
+        results = run_phase(args.uri, phase, names, args.dim, args.concurrency)
+        curves[phase] = degradation_curve(phase, results, args.bucket)
+
+    for phase, curve in curves.items():
+        print(f"\n========== {phase.upper()} LATENCY VS COUNT (ms) ==========")
+        print_curve(curve)
+    if args.csv:
+        write_csv(args.csv, [r for curve in curves.values() for r in curve])
+    if args.plot:
+        plot_curves(curves, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Prometheus queries target the monitor/ stack (see monitor/prometheus/prometheus.yml);
+everything degrades to None when Prometheus is unreachable so benchmarks still run
+against a bare Milvus.
+
+percentiles, print_table, write_csv, SharedRatePacer and require_internals come
+from milvus_client_scripts/bench_util.py and are re-exported here.
+"""
+
+import os
+import sys
+import time
+
+import requests
+from pymilvus.bulk_writer import get_import_progress
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "milvus_client_scripts"))
+from bench_util import (  # noqa: E402,F401
+    SharedRatePacer, percentiles, print_table, require_internals, write_csv,
+)
+
+MILVUS_URI = os.getenv("MILVUS_URI", "http://localhost:19530")
+PROMETHEUS_URL = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+# app_kubernetes_io_instance label from prometheus.yml: "standalone" or "cluster"
+PROM_INSTANCE = os.getenv("PROM_INSTANCE", "standalone")
+PROM_SCRAPE_INTERVAL = 5
+# Standalone runs every role in one process, so its querynode is the standalone component.
+QUERYNODE_COMPONENT = "querynode" if PROM_INSTANCE == "cluster" else "standalone"
+
+
+def wait_for_import(job_id, uri=MILVUS_URI, timeout=3600, poll_interval=1.0, verbose=False):
+    """Poll a bulk import job until it completes.
+
+    Raises RuntimeError if the job fails and TimeoutError after `timeout` seconds.
+    """
+    start = time.time()
+    while time.time() - start < timeout:
+        data = get_import_progress(url=uri, job_id=job_id).json().get("data", {})
+        state = data.get("state", "Unknown")
+        if verbose:
+            print(f"  state={state}, progress={data.get('progress', 0)}")
+        if state == "Completed":
+            return
+        if state == "Failed":
+            raise RuntimeError(f"Import job {job_id} failed: {data.get('reason', 'unknown')}")
+        time.sleep(poll_interval)
+    raise TimeoutError(f"Import job {job_id} did not complete within {timeout}s")
+
+
+def prom_query(expr):
+    """Run an instant PromQL query and return the first sample as float, or None."""
+    try:
+        resp = requests.get(f"{PROMETHEUS_URL}/api/v1/query", params={"query": expr}, timeout=5)
+        resp.raise_for_status()
+        result = resp.json()["data"]["result"]
+    except (requests.RequestException, KeyError, ValueError):
+        return None
+    if not result:
+        return None
+    return float(result[0]["value"][1])
+
+
+def _selector(instance, component):
+    selector = f'app_kubernetes_io_instance="{instance}"'
+    if component:
+        selector += f',component="{component}"'
+    return selector
+
+
+def server_cpu_seconds(instance=PROM_INSTANCE, component=None):
+    """Total process CPU seconds consumed by the Milvus processes of `instance`."""
+    return prom_query(f"sum(process_cpu_seconds_total{{{_selector(instance, component)}}})")
+
+
+def server_memory_bytes(instance=PROM_INSTANCE, component=QUERYNODE_COMPONENT):
+    """Resident memory of the Milvus processes of `instance` (querynode by default)."""
+    return prom_query(f"sum(process_resident_memory_bytes{{{_selector(instance, component)}}})")
+
+
+def server_peak_memory_bytes(seconds, instance=PROM_INSTANCE, component=QUERYNODE_COMPONENT):
+    """Peak resident memory over the last `seconds`, at scrape resolution."""
+    expr = f"sum(process_resident_memory_bytes{{{_selector(instance, component)}}})"
+    return prom_query(f"max_over_time({expr}[{max(int(seconds), PROM_SCRAPE_INTERVAL)}s:{PROM_SCRAPE_INTERVAL}s])")
+
+
+def wait_scrape():
+    """Sleep long enough for Prometheus to scrape the latest counter values."""
+    time.sleep(PROM_SCRAPE_INTERVAL * 2)
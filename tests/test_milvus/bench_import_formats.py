@@ -0,0 +1,219 @@
+"""
+Import throughput benchmark across file formats.
+
+Generates one logical dataset (id INT64 PK, FLOAT_VECTOR, VARCHAR) and imports it
+via bulk_import as Parquet, row-based JSON, NumPy-per-field and binlog backup.
+For each format it reports rows/s, server CPU seconds (process_cpu_seconds_total
+from the monitor/ Prometheus) and bytes stored in object storage.
+
+The binlog source is produced by inserting the same rows into a staging
+collection and flushing; that part is not timed.
+
+Usage:
+  python bench_import_formats.py --rows 200000 --dim 128
+  python bench_import_formats.py --formats parquet,numpy --repeat 3 --csv import_bench.csv
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pymilvus import MilvusClient, DataType, connections, utility
+from pymilvus.bulk_writer import bulk_import
+
+from binlog_index import MINIO_BUCKET, MILVUS_ROOT_PATH, build_index, s3_client
+from bench_common import MILVUS_URI, server_cpu_seconds, wait_for_import, wait_scrape, write_csv, print_table
+
+FORMATS = ["parquet", "json", "numpy", "binlog"]
+STAGING_COLLECTION = "bench_import_binlog_source"
+TARGET_PREFIX = "bench_import"
+INSERT_BATCH = 10000
+BINLOG_OPTIONS = {"backup": "true", "storage_version": "2"}
+
+
+def generate_dataset(num_rows, dim, seed=42):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(num_rows, dtype=np.int64)
+    vectors = rng.random((num_rows, dim), dtype=np.float32)
+    varchars = [f"row_{i}" for i in range(num_rows)]
+    return {"id": ids, "vec": vectors, "varchar": varchars}
+
+
+def create_collection(client, name, dim):
+    if client.has_collection(name):
+        client.drop_collection(name)
+    schema = client.create_schema()
+    schema.add_field("id", DataType.INT64, is_primary=True)
+    schema.add_field("vec", DataType.FLOAT_VECTOR, dim=dim)
+    schema.add_field("varchar", DataType.VARCHAR, max_length=256)
+    client.create_collection(collection_name=name, schema=schema)
+
+
+# ---------- File writers: each returns a list of local paths ----------
+
+def write_parquet(ds, out_dir):
+    n, dim = ds["vec"].shape
+    offsets = np.arange(0, (n + 1) * dim, dim, dtype=np.int32)
+    table = pa.table({
+        "id": pa.array(ds["id"]),
+        "vec": pa.ListArray.from_arrays(pa.array(offsets), pa.array(ds["vec"].ravel())),
+        "varchar": pa.array(ds["varchar"], type=pa.string()),
+    })
+    path = os.path.join(out_dir, "data.parquet")
+    pq.write_table(table, path)
+    return [path]
+
+
+def write_json(ds, out_dir):
+    path = os.path.join(out_dir, "data.json")
+    rows = [
+        {"id": int(i), "vec": v, "varchar": s}
+        for i, v, s in zip(ds["id"], ds["vec"].tolist(), ds["varchar"])
+    ]
+    with open(path, "w") as f:
+        json.dump(rows, f)
+    return [path]
+
+
+def write_numpy(ds, out_dir):
+    # The numpy reader maps files to fields by file name.
+    paths = []
+    for field, arr in (("id", ds["id"]), ("vec", ds["vec"]), ("varchar", np.array(ds["varchar"]))):
+        path = os.path.join(out_dir, f"{field}.npy")
+        np.save(path, arr)
+        paths.append(path)
+    return paths
+
+
+WRITERS = {"parquet": write_parquet, "json": write_json, "numpy": write_numpy}
+
+
+def upload_files(s3, fmt, paths):
+    """Upload local files; returns (import files list, total bytes)."""
+    run_id = int(time.time() * 1000)
+    keys = []
+    total = 0
+    for path in paths:
+        key = f"{MILVUS_ROOT_PATH}/{TARGET_PREFIX}/{fmt}_{run_id}/{os.path.basename(path)}"
+        s3.upload_file(path, MINIO_BUCKET, key)
+        keys.append(key)
+        total += os.path.getsize(path)
+    # All per-field files of one dataset form a single import batch.
+    return [keys], total
+
+
+def prepare_binlog(client, s3, ds):
+    """Insert ds into a staging collection and flush. Returns (import files, bytes)."""
+    n, dim = ds["vec"].shape
+    create_collection(client, STAGING_COLLECTION, dim)
+    for start in range(0, n, INSERT_BATCH):
+        end = min(start + INSERT_BATCH, n)
+        rows = [
+            {"id": int(ds["id"][i]), "vec": ds["vec"][i], "varchar": ds["varchar"][i]}
+            for i in range(start, end)
+        ]
+        client.insert(collection_name=STAGING_COLLECTION, data=rows)
+    client.flush(collection_name=STAGING_COLLECTION)
+
+    collection_id = client.describe_collection(STAGING_COLLECTION)["collection_id"]
+    segments = utility.get_persistent_segment_info(STAGING_COLLECTION)
+    assert segments, "No persistent segments found after flush"
+
+    index = build_index(collection_id, log_types=("insert_log",), s3=s3)
+    files, total = [], 0
+    for seg in segments:
+        logs = index.logs["insert_log"][seg.partitionID][seg.segmentID]
+        files.append([logs.prefix])
+        total += logs.total_bytes
+    print(f"Staged {n} rows in {len(segments)} binlog segments ({total} bytes)")
+    return files, total
+
+
+def run_import(client, fmt, files, dim, timeout):
+    """Import files into a fresh collection. Returns (seconds, cpu_seconds, rows)."""
+    target = f"{TARGET_PREFIX}_{fmt}"
+    create_collection(client, target, dim)
+    options = BINLOG_OPTIONS if fmt == "binlog" else None
+
+    cpu_before = server_cpu_seconds()
+    start = time.time()
+    resp = bulk_import(url=MILVUS_URI, collection_name=target, files=files, options=options)
+    job_id = resp.json()["data"]["jobId"]
+    wait_for_import(job_id, timeout=timeout, poll_interval=0.5)
+    elapsed = time.time() - start
+
+    cpu_used = None
+    if cpu_before is not None:
+        wait_scrape()
+        cpu_after = server_cpu_seconds()
+        if cpu_after is not None:
+            cpu_used = cpu_after - cpu_before
+
+    rows = int(client.get_collection_stats(target)["row_count"])
+    client.drop_collection(target)
+    return elapsed, cpu_used, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=int, default=1800)
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {sorted(unknown)}")
+
+    client = MilvusClient(uri=MILVUS_URI)
+    connections.connect("default", uri=MILVUS_URI)
+    s3 = s3_client()
+
+    ds = generate_dataset(args.rows, args.dim)
+    print(f"Generated {args.rows} rows, dim={args.dim}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            if fmt == "binlog":
+                files, stored = prepare_binlog(client, s3, ds)
+            else:
+                out_dir = os.path.join(tmp, fmt)
+                os.makedirs(out_dir)
+                files, stored = upload_files(s3, fmt, WRITERS[fmt](ds, out_dir))
+
+            for i in range(args.repeat):
+                elapsed, cpu, rows = run_import(client, fmt, files, args.dim, args.timeout)
+                assert rows == args.rows, f"[{fmt}] expected {args.rows} rows, got {rows}"
+                results.append({
+                    "format": fmt,
+                    "run": i + 1,
+                    "rows": rows,
+                    "dim": args.dim,
+                    "seconds": elapsed,
+                    "rows_per_s": rows / elapsed,
+                    "server_cpu_s": cpu if cpu is not None else "n/a",
+                    "object_bytes": stored,
+                })
+                print(f"[{fmt}] run {i + 1}: {elapsed:.2f}s, {rows / elapsed:.0f} rows/s")
+
+    if client.has_collection(STAGING_COLLECTION):
+        client.drop_collection(STAGING_COLLECTION)
+
+    print()
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
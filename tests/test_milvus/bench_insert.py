@@ -0,0 +1,151 @@
+"""
+Insert latency benchmark, replacing the one-line-per-round timing of
+insert_data.py / simple_insert.py.
+
+Sweeps batch size x dim x client concurrency against the same quick-setup
+collection those scripts use (id, vector, dynamic "a"). Every request carries
+fresh primary keys. Each insert is split in two:
+  - serialize: building the InsertRequest protobuf from row dicts (client CPU)
+  - rpc:       sending it and waiting for the server's reply
+so client-side cost is visible separately from server time. Reports p50/p95/p99
+of the total, the p50 of each part, rows/s and MB/s (request protobuf bytes).
+
+Usage:
+  python bench_insert.py
+  python bench_insert.py --batch-sizes 100,1000 --dims 128,1024 --concurrency 1,8 --requests 200 --csv insert_bench.csv
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymilvus import MilvusClient
+from pymilvus.client.utils import check_status
+
+from bench_common import MILVUS_URI, percentiles, print_table, require_internals, write_csv
+
+COLLECTION = "bench_insert"
+
+
+def make_rows(start_id, vectors):
+    return [{"id": start_id + i, "vector": v, "a": (start_id + i) * 100} for i, v in enumerate(vectors)]
+
+
+class TimedInserter:
+    """Insert through the gRPC handler in two timed steps: build request, send it.
+
+    MilvusClient.insert does both in one call, so this uses private pymilvus APIs;
+    they are checked on construction (see bench_util.PYMILVUS_INTERNALS_VERSION).
+    """
+
+    def __init__(self, uri, collection):
+        self.client = MilvusClient(uri=uri)
+        self.collection = collection
+        require_internals(self.client, "_get_connection", purpose="bench_insert")
+        self.handler = self.client._get_connection()
+        require_internals(self.handler, "_prepare_row_insert_request", "_stub.Insert", purpose="bench_insert")
+        # Passing the schema keeps describe_collection out of the serialize step.
+        self.schema = self.client.describe_collection(collection)
+
+    def close(self):
+        self.client.close()
+
+    def insert(self, rows):
+        """Returns (serialize_s, rpc_s, request_bytes)."""
+        t0 = time.perf_counter()
+        request = self.handler._prepare_row_insert_request(self.collection, rows, schema=self.schema)
+        t1 = time.perf_counter()
+        resp = self.handler._stub.Insert(request)
+        t2 = time.perf_counter()
+        check_status(resp.status)
+        return t1 - t0, t2 - t1, request.ByteSize()
+
+
+def run_config(uri, batch_size, dim, concurrency, num_requests, start_id=0, seed=19530):
+    """Run num_requests inserts of batch_size rows with `concurrency` clients.
+
+    Primary keys run from start_id up to start_id + num_requests * batch_size.
+    """
+    rng = np.random.default_rng(seed)
+    # One vector block reused with fresh ids per request; generation is not timed.
+    vectors = rng.random((batch_size, dim), dtype=np.float32)
+    inserters = [TimedInserter(uri, COLLECTION) for _ in range(concurrency)]
+    samples = []
+
+    def worker(w):
+        out = []
+        for r in range(w, num_requests, concurrency):
+            rows = make_rows(start_id + r * batch_size, vectors)
+            out.append(inserters[w].insert(rows))
+        return out
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for out in pool.map(worker, range(concurrency)):
+                samples.extend(out)
+        elapsed = time.perf_counter() - start
+    finally:
+        for inserter in inserters:
+            inserter.close()
+
+    serialize_ms = [s * 1000 for s, _, _ in samples]
+    rpc_ms = [r * 1000 for _, r, _ in samples]
+    total_ms = [s + r for s, r in zip(serialize_ms, rpc_ms)]
+    total = percentiles(total_ms)
+    rows = len(samples) * batch_size
+    return {
+        "batch": batch_size,
+        "dim": dim,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "rows_per_s": rows / elapsed,
+        "mb_per_s": sum(b for _, _, b in samples) / 1024 / 1024 / elapsed,
+        "p50_ms": total["p50"],
+        "p95_ms": total["p95"],
+        "p99_ms": total["p99"],
+        "serialize_p50_ms": percentiles(serialize_ms)["p50"],
+        "rpc_p50_ms": percentiles(rpc_ms)["p50"],
+        "serialize_share": sum(serialize_ms) / sum(total_ms) if total_ms else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--batch-sizes", default="100,1000,10000")
+    parser.add_argument("--dims", default="128,1024")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=100, help="inserts per configuration")
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    batch_sizes = [int(v) for v in args.batch_sizes.split(",")]
+    dims = [int(v) for v in args.dims.split(",")]
+    concurrencies = [int(v) for v in args.concurrency.split(",")]
+
+    client = MilvusClient(uri=args.uri)
+    run_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    results = []
+    next_id = 0  # ids keep growing across configurations so no request upserts old keys
+    for dim in dims:
+        client.drop_collection(COLLECTION)
+        client.create_collection(COLLECTION, dim, consistency_level="Strong", metric_type="L2")
+        for batch_size in batch_sizes:
+            for concurrency in concurrencies:
+                r = run_config(args.uri, batch_size, dim, concurrency, args.requests, start_id=next_id)
+                next_id += args.requests * batch_size
+                print(f"  batch={batch_size} dim={dim} concurrency={concurrency}: "
+                      f"p50={r['p50_ms']:.1f}ms {r['rows_per_s']:.0f} rows/s")
+                results.append({"run_at": run_at, **r})
+    client.drop_collection(COLLECTION)
+
+    print("\n========== INSERT LATENCY (ms) ==========")
+    print_table(results, columns=[c for c in results[0] if c != "run_at"])
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
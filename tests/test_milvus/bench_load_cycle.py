@@ -0,0 +1,153 @@
+"""
+Load/release cycle benchmark, extending load_again.py.
+
+For every (flush count, replica number) configuration a collection is
+built by --flushes insert+flush steps of --rows-per-flush rows, then
+release -> load -> first query is repeated --cycles times. Each flush seals
+up to one segment per shard and compaction may merge them later, so results
+are labelled with the number of segments actually loaded (loaded_segments)
+as well. Per cycle it times:
+  - release_collection
+  - load_collection (returns once the collection is loaded)
+  - time to first query: from load returning until a query succeeds
+and reports their distributions together with querynode resident memory from
+the monitor/ Prometheus (released, loaded and peak over the configuration).
+
+Replica numbers above the number of query nodes fail to load; those cycles
+are counted as errors rather than aborting the run.
+
+Usage:
+  python bench_load_cycle.py
+  python bench_load_cycle.py --flushes 1,16,64 --replicas 1,2 --cycles 50 --csv load_cycle.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pymilvus import MilvusClient, connections, utility
+
+from bench_common import (
+    MILVUS_URI, percentiles, print_table, server_memory_bytes, server_peak_memory_bytes,
+    wait_scrape, write_csv,
+)
+
+COLLECTION = "bench_load_cycle"
+ALIAS = "bench_load_cycle"
+QUERY_POLL_INTERVAL = 0.01
+QUERY_TIMEOUT = 60
+
+
+def _mb(value):
+    return value / 1024 / 1024 if value is not None else float("nan")
+
+
+def build_collection(client, num_flushes, rows_per_flush, dim, shards):
+    client.drop_collection(COLLECTION)
+    client.create_collection(COLLECTION, dim, shards_num=shards, consistency_level="Bounded", metric_type="L2")
+    client.release_collection(COLLECTION)
+    rng = np.random.default_rng(seed=19530)
+    for s in range(num_flushes):
+        ids = range(s * rows_per_flush, (s + 1) * rows_per_flush)
+        vectors = rng.random((rows_per_flush, dim), dtype=np.float32)
+        client.insert(COLLECTION, [{"id": i, "vector": v} for i, v in zip(ids, vectors)])
+        client.flush(COLLECTION)
+
+
+def first_query_seconds(client):
+    """Seconds until a query returns a row, or None on timeout."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < QUERY_TIMEOUT:
+        try:
+            if client.query(COLLECTION, ids=[0]):
+                return time.perf_counter() - start
+        except Exception:
+            pass
+        time.sleep(QUERY_POLL_INTERVAL)
+    return None
+
+
+def _loaded_segments():
+    """Distinct loaded segments; get_query_segment_info lists each segment once per replica."""
+    return len({s.segmentID for s in utility.get_query_segment_info(COLLECTION, using=ALIAS)})
+
+
+def run_config(client, num_flushes, replicas, cycles):
+    release_ms, load_ms, ttfq_ms = [], [], []
+    errors = 0
+    loaded_segments = 0
+
+    # The previous configuration may have left the collection loaded.
+    client.release_collection(COLLECTION)
+    wait_scrape()
+    mem_released = server_memory_bytes()
+    start = time.time()
+    for _ in range(cycles):
+        t0 = time.perf_counter()
+        client.release_collection(COLLECTION)
+        release_ms.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        try:
+            client.load_collection(COLLECTION, replica_number=replicas)
+        except Exception as e:
+            errors += 1
+            print(f"  load with {replicas} replicas failed: {e}")
+            continue
+        load_ms.append((time.perf_counter() - t0) * 1000)
+
+        ttfq = first_query_seconds(client)
+        if ttfq is None:
+            errors += 1
+        else:
+            ttfq_ms.append(ttfq * 1000)
+        # Only after a successful load, and outside the timed steps.
+        loaded_segments = _loaded_segments()
+
+    wait_scrape()
+    mem_loaded = server_memory_bytes()
+    mem_peak = server_peak_memory_bytes(time.time() - start)
+
+    result = {"flushes": num_flushes, "loaded_segments": loaded_segments, "replicas": replicas,
+              "cycles": cycles, "errors": errors}
+    for name, values in (("release", release_ms), ("load", load_ms), ("ttfq", ttfq_ms)):
+        p = percentiles(values)
+        result.update({f"{name}_p50_ms": p["p50"], f"{name}_p99_ms": p["p99"]})
+    result.update({"mem_released_mb": _mb(mem_released), "mem_loaded_mb": _mb(mem_loaded),
+                   "mem_peak_mb": _mb(mem_peak)})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--flushes", default="1,8,32", help="insert+flush steps per collection")
+    parser.add_argument("--replicas", default="1")
+    parser.add_argument("--rows-per-flush", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--shards", type=int, default=2)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    client = MilvusClient(uri=args.uri)
+    connections.connect(ALIAS, uri=args.uri)
+    results = []
+    for num_flushes in [int(v) for v in args.flushes.split(",")]:
+        build_collection(client, num_flushes, args.rows_per_flush, args.dim, args.shards)
+        for replicas in [int(v) for v in args.replicas.split(",")]:
+            r = run_config(client, num_flushes, replicas, args.cycles)
+            print(f"  flushes={num_flushes} loaded_segments={r['loaded_segments']} replicas={replicas}: "
+                  f"load p50={r['load_p50_ms']:.0f}ms ttfq p50={r['ttfq_p50_ms']:.0f}ms")
+            results.append(r)
+    client.drop_collection(COLLECTION)
+    connections.disconnect(ALIAS)
+
+    print("\n========== LOAD/RELEASE CYCLES (ms, MB) ==========")
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
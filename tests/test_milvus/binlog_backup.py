@@ -0,0 +1,266 @@
+"""
+Collection backup/restore via binlog import, generalizing test_binlog_import.py.
+
+backup:  flush the source collection, record its schema, partitions and every
+         flushed segment's insert logs plus all L0 delta logs in a JSON manifest.
+         With --copy, objects are server-side copied under
+         <root>/binlog_backup/<name>/ first, so the snapshot survives compaction
+         and GC of the source.
+restore: recreate the collection (same schema, partitions, consistency level
+         and properties) on the target cluster and import the segments with
+         bounded concurrency: all L1 (insert log) jobs first, then L0 (delta
+         log) jobs so deletes apply on top of the restored rows. Reports rows/s
+         and MB/s.
+
+The target cluster must read the same bucket as the backup.
+
+Usage:
+  python binlog_backup.py backup  <collection> backup.json [--copy]
+  python binlog_backup.py restore backup.json <target_collection> [--target-uri URI]
+  python binlog_backup.py clone   <collection> <target_collection> --concurrency 8
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymilvus import MilvusClient, CollectionSchema, connections, utility
+from pymilvus.bulk_writer import bulk_import
+from pymilvus.client.utils import check_status
+from pymilvus.grpc_gen import milvus_pb2
+
+from bench_common import require_internals, wait_for_import
+from binlog_index import MINIO_BUCKET, MILVUS_ROOT_PATH, build_index, s3_client
+
+MILVUS_URI = "http://localhost:19530"
+DEFAULT_STORAGE_VERSION = "2"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_SEGMENTS_PER_JOB = 8
+IMPORT_TIMEOUT = 3600
+
+
+def _copy_prefixes(s3, prefixes, dest_root, workers):
+    """Server-side copy every object under each prefix to dest_root/<same relative path>.
+
+    Returns {old_prefix: new_prefix}.
+    """
+    index = {}
+    jobs = []
+    for prefix in prefixes:
+        new_prefix = f"{dest_root}/{prefix[len(MILVUS_ROOT_PATH) + 1:]}"
+        index[prefix] = new_prefix
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=MINIO_BUCKET, Prefix=prefix + "/"):
+            for obj in page.get("Contents", []):
+                jobs.append((obj["Key"], new_prefix + obj["Key"][len(prefix):]))
+
+    def copy(job):
+        src, dst = job
+        s3.copy_object(Bucket=MINIO_BUCKET, Key=dst,
+                       CopySource={"Bucket": MINIO_BUCKET, "Key": src})
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(copy, jobs))
+    print(f"Copied {len(jobs)} objects to {dest_root}/")
+    return index
+
+
+def backup(collection, uri=MILVUS_URI, copy=False, workers=32):
+    """Snapshot a collection's binlogs. Returns the manifest dict."""
+    client = MilvusClient(uri=uri)
+    connections.connect("backup_source", uri=uri)
+
+    client.flush(collection_name=collection)
+    desc = client.describe_collection(collection)
+    collection_id = desc["collection_id"]
+
+    segments = utility.get_persistent_segment_info(collection, using="backup_source")
+
+    s3 = s3_client(workers)
+    index = build_index(collection_id, log_types=("insert_log", "delta_log"), s3=s3, workers=workers)
+
+    l1 = []
+    for seg in segments:
+        logs = index.logs["insert_log"].get(seg.partitionID, {}).get(seg.segmentID)
+        if logs is None:
+            print(f"  segment {seg.segmentID}: no insert logs found, skipped")
+            continue
+        l1.append({
+            "partition_id": seg.partitionID,
+            "segment_id": seg.segmentID,
+            "num_rows": seg.num_rows,
+            "prefix": logs.prefix,
+            "bytes": logs.total_bytes,
+        })
+    l0 = [
+        {"partition_id": s.partition_id, "segment_id": s.segment_id,
+         "prefix": s.prefix, "bytes": s.total_bytes}
+        for s in index.segments("delta_log")
+    ]
+
+    manifest = {
+        "collection": collection,
+        "collection_id": collection_id,
+        "created_at": int(time.time()),
+        "schema": desc,
+        "partition_ids": _partition_ids("backup_source", collection),
+        "l1_segments": l1,
+        "l0_segments": l0,
+    }
+
+    if copy:
+        dest_root = f"{MILVUS_ROOT_PATH}/binlog_backup/{collection}_{manifest['created_at']}"
+        moved = _copy_prefixes(s3, [s["prefix"] for s in l1 + l0], dest_root, workers)
+        for s in l1 + l0:
+            s["prefix"] = moved[s["prefix"]]
+
+    rows = sum(s["num_rows"] for s in l1)
+    size = sum(s["bytes"] for s in l1 + l0)
+    print(f"Backup of '{collection}': {len(l1)} L1 segments ({rows} rows), "
+          f"{len(l0)} L0 segments, {size / 1024 / 1024:.1f} MB")
+    connections.disconnect("backup_source")
+    return manifest
+
+
+def _partition_ids(alias, collection):
+    """{partition_id: partition_name}.
+
+    Segments only know their partition ID, and no public pymilvus API (list_partitions,
+    describe_collection, ORM Partition) exposes partition IDs, so this calls the raw
+    ShowPartitions RPC; see bench_util.PYMILVUS_INTERNALS_VERSION.
+    """
+    require_internals(connections, "_fetch_handler", purpose="binlog_backup")
+    handler = connections._fetch_handler(alias)
+    require_internals(handler, "_stub.ShowPartitions", purpose="binlog_backup")
+    resp = handler._stub.ShowPartitions(milvus_pb2.ShowPartitionsRequest(collection_name=collection))
+    check_status(resp.status)
+    return {str(pid): name for pid, name in zip(resp.partitionIDs, resp.partition_names)}
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run_jobs(uri, target, batches, options, concurrency):
+    """Run (partition_name, files) import batches with at most `concurrency` in flight."""
+    def run(batch):
+        partition_name, files = batch
+        kwargs = {"partition_name": partition_name} if partition_name else {}
+        resp = bulk_import(url=uri, collection_name=target, files=files, options=options, **kwargs)
+        job_id = resp.json()["data"]["jobId"]
+        start = time.time()
+        wait_for_import(job_id, uri=uri, timeout=IMPORT_TIMEOUT)
+        print(f"  job {job_id}: {len(files)} segments in {time.time() - start:.1f}s")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, batches))
+
+
+def restore(manifest, target, uri=MILVUS_URI, concurrency=DEFAULT_CONCURRENCY,
+            segments_per_job=DEFAULT_SEGMENTS_PER_JOB, storage_version=DEFAULT_STORAGE_VERSION):
+    """Recreate `target` from a manifest and import its segments. Returns a stats dict."""
+    client = MilvusClient(uri=uri)
+    if client.has_collection(target):
+        raise RuntimeError(f"Target collection '{target}' already exists")
+
+    desc = manifest["schema"]
+    schema = CollectionSchema.construct_from_dict(desc)
+    kwargs = {k: desc[k] for k in ("consistency_level", "properties") if desc.get(k) is not None}
+    partition_key = any(f.get("is_partition_key") for f in desc["fields"])
+    if partition_key:
+        # Partition-key collections create their partitions (same names) themselves.
+        kwargs["num_partitions"] = desc.get("num_partitions", len(manifest["partition_ids"]))
+    client.create_collection(collection_name=target, schema=schema,
+                             num_shards=desc.get("num_shards", 1), **kwargs)
+    if not partition_key:
+        for name in manifest["partition_ids"].values():
+            if not client.has_partition(target, name):
+                client.create_partition(collection_name=target, partition_name=name)
+
+    pid_to_name = manifest["partition_ids"]
+
+    def batches(segments):
+        by_part = {}
+        for seg in segments:
+            # Collection-level L0 segments carry partition_id -1: import without partition.
+            name = pid_to_name.get(str(seg["partition_id"]), "")
+            by_part.setdefault(name, []).append([seg["prefix"]])
+        return [(name, chunk) for name, files in by_part.items()
+                for chunk in _chunks(files, segments_per_job)]
+
+    l1, l0 = manifest["l1_segments"], manifest["l0_segments"]
+    rows = sum(s["num_rows"] for s in l1)
+    size = sum(s["bytes"] for s in l1 + l0)
+
+    start = time.time()
+    print(f"Restoring {len(l1)} L1 segments into '{target}' (concurrency={concurrency})")
+    _run_jobs(uri, target, batches(l1),
+              {"backup": "true", "storage_version": storage_version}, concurrency)
+    l1_elapsed = time.time() - start
+    if l0:
+        print(f"Restoring {len(l0)} L0 segments")
+        _run_jobs(uri, target, batches(l0),
+                  {"l0_import": "true", "storage_version": storage_version}, concurrency)
+    elapsed = time.time() - start
+
+    stats = {
+        "rows": rows,
+        "bytes": size,
+        "l1_seconds": l1_elapsed,
+        "total_seconds": elapsed,
+        "rows_per_s": rows / elapsed if elapsed else 0.0,
+        "mb_per_s": size / 1024 / 1024 / elapsed if elapsed else 0.0,
+    }
+    print(f"Restore done: {rows} rows, {size / 1024 / 1024:.1f} MB in {elapsed:.1f}s "
+          f"({stats['rows_per_s']:.0f} rows/s, {stats['mb_per_s']:.1f} MB/s)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("backup")
+    p.add_argument("collection")
+    p.add_argument("manifest")
+    p.add_argument("--uri", default=MILVUS_URI)
+    p.add_argument("--copy", action="store_true", help="copy binlogs to a backup prefix")
+
+    p = sub.add_parser("restore")
+    p.add_argument("manifest")
+    p.add_argument("target")
+
+    p = sub.add_parser("clone")
+    p.add_argument("collection")
+    p.add_argument("target")
+    p.add_argument("--uri", default=MILVUS_URI)
+    p.add_argument("--copy", action="store_true")
+
+    for p in sub.choices.values():
+        if p.prog.split()[-1] != "backup":
+            p.add_argument("--target-uri", default=MILVUS_URI)
+            p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+            p.add_argument("--segments-per-job", type=int, default=DEFAULT_SEGMENTS_PER_JOB)
+            p.add_argument("--storage-version", default=DEFAULT_STORAGE_VERSION)
+    args = parser.parse_args()
+
+    if args.cmd == "backup":
+        manifest = backup(args.collection, uri=args.uri, copy=args.copy)
+        with open(args.manifest, "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        print(f"Manifest written to {args.manifest}")
+        return
+
+    if args.cmd == "restore":
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+    else:
+        manifest = json.loads(json.dumps(backup(args.collection, uri=args.uri, copy=args.copy),
+                                         default=str))
+    restore(manifest, args.target, uri=args.target_uri, concurrency=args.concurrency,
+            segments_per_job=args.segments_per_job, storage_version=args.storage_version)
+
+
+if __name__ == "__main__":
+    main()
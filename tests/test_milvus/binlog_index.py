@@ -0,0 +1,153 @@
+"""
+Paginated, concurrent walker for a collection's binlog trees in object storage.
+
+Layout (storage v1 and v2 alike, below the segment level the depth varies):
+  <root>/insert_log/<collection>/<partition>/<segment>/...
+  <root>/delta_log/<collection>/<partition>/<segment>/...
+  <root>/stats_log/<collection>/<partition>/<segment>/...
+
+build_index() lists partitions, then segments, then (optionally) files, fanning
+each level out over a thread pool and following list_objects_v2 continuation
+tokens so collections with more than 1000 segments/files are fully enumerated.
+
+Usage:
+  python binlog_index.py <collection_id> [--no-files]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import boto3
+from botocore.config import Config
+
+MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
+MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
+MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "minioadmin")
+MINIO_BUCKET = os.getenv("MINIO_BUCKET", "a-bucket")
+MILVUS_ROOT_PATH = os.getenv("MILVUS_ROOT_PATH", "files")
+
+LOG_TYPES = ("insert_log", "delta_log", "stats_log")
+DEFAULT_WORKERS = 32
+
+
+@dataclass
+class BinlogFile:
+    key: str
+    size: int
+
+
+@dataclass
+class SegmentLogs:
+    partition_id: int
+    segment_id: int
+    prefix: str  # no trailing slash; this is what bulk_import expects
+    files: list = field(default_factory=list)
+
+    @property
+    def total_bytes(self):
+        return sum(f.size for f in self.files)
+
+
+@dataclass
+class BinlogIndex:
+    """log_type -> partition_id -> segment_id -> SegmentLogs."""
+    collection_id: int
+    logs: dict = field(default_factory=lambda: {t: {} for t in LOG_TYPES})
+
+    def segments(self, log_type):
+        """All SegmentLogs of one log type, ordered by (partition, segment)."""
+        parts = self.logs.get(log_type, {})
+        return [parts[p][s] for p in sorted(parts) for s in sorted(parts[p])]
+
+    def import_files(self, log_type):
+        """bulk_import `files` argument: one batch per segment prefix."""
+        return [[seg.prefix] for seg in self.segments(log_type)]
+
+    def total_bytes(self, log_type=None):
+        types = [log_type] if log_type else list(self.logs)
+        return sum(seg.total_bytes for t in types for seg in self.segments(t))
+
+
+def s3_client(max_pool_connections=DEFAULT_WORKERS):
+    return boto3.client(
+        "s3", endpoint_url=MINIO_ENDPOINT,
+        aws_access_key_id=MINIO_ACCESS_KEY, aws_secret_access_key=MINIO_SECRET_KEY,
+        config=Config(max_pool_connections=max_pool_connections),
+    )
+
+
+def list_dirs(s3, prefix, bucket=MINIO_BUCKET):
+    """All immediate sub-prefixes of `prefix` (which must end with '/'), paginated."""
+    dirs = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+        dirs.extend(cp["Prefix"] for cp in page.get("CommonPrefixes", []))
+    return dirs
+
+
+def list_files(s3, prefix, bucket=MINIO_BUCKET):
+    """All objects below `prefix`, recursively, paginated."""
+    files = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        files.extend(BinlogFile(obj["Key"], obj["Size"]) for obj in page.get("Contents", []))
+    return files
+
+
+def _last_id(prefix):
+    return int(prefix.rstrip("/").rsplit("/", 1)[-1])
+
+
+def build_index(collection_id, log_types=LOG_TYPES, with_files=True,
+                s3=None, workers=DEFAULT_WORKERS, root_path=MILVUS_ROOT_PATH,
+                bucket=MINIO_BUCKET):
+    """Walk the binlog trees of a collection and return a BinlogIndex."""
+    s3 = s3 or s3_client(workers)
+    index = BinlogIndex(collection_id=int(collection_id), logs={t: {} for t in log_types})
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Level 1: partitions, one listing per log type.
+        roots = {t: f"{root_path}/{t}/{collection_id}/" for t in log_types}
+        part_dirs = dict(zip(roots, pool.map(lambda p: list_dirs(s3, p, bucket), roots.values())))
+
+        # Level 2: segments, one listing per partition.
+        part_jobs = [(t, d) for t in log_types for d in part_dirs[t]]
+        seg_dirs = pool.map(lambda job: list_dirs(s3, job[1], bucket), part_jobs)
+        segments = []
+        for (log_type, part_dir), dirs in zip(part_jobs, seg_dirs):
+            pid = _last_id(part_dir)
+            by_seg = index.logs[log_type].setdefault(pid, {})
+            for seg_dir in dirs:
+                seg = SegmentLogs(partition_id=pid, segment_id=_last_id(seg_dir),
+                                  prefix=seg_dir.rstrip("/"))
+                by_seg[seg.segment_id] = seg
+                segments.append(seg)
+
+        # Level 3: files, one (paginated) listing per segment.
+        if with_files:
+            for seg, files in zip(segments, pool.map(
+                    lambda s: list_files(s3, s.prefix + "/", bucket), segments)):
+                seg.files = files
+
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("collection_id", type=int)
+    parser.add_argument("--no-files", action="store_true", help="only enumerate segment dirs")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    start = time.time()
+    idx = build_index(args.collection_id, with_files=not args.no_files, workers=args.workers)
+    elapsed = time.time() - start
+    for log_type in idx.logs:
+        segs = idx.segments(log_type)
+        nfiles = sum(len(s.files) for s in segs)
+        print(f"{log_type}: {len(idx.logs[log_type])} partitions, {len(segs)} segments, "
+              f"{nfiles} files, {idx.total_bytes(log_type)} bytes")
+    print(f"Indexed in {elapsed:.2f}s")
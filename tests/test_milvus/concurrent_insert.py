@@ -0,0 +1,142 @@
+"""
+Multi-process concurrent insert load generator, the Python counterpart of
+concurrent_insert_go/insert.go.
+
+Same workload as the Go tool: a quick-setup collection (auto id, "vector" of
+--dim), column-based inserts of --entities deterministic vectors, --inserts
+inserts per worker. Workers are --processes processes (default: one per core)
+x --threads threads, each thread with its own connection, so the GIL does not
+cap the offered load. An optional shared rate limiter (--rate, rows/s across
+all processes) paces the load; without it every worker inserts back to back.
+
+Timing starts once every worker is connected. The summary line uses the Go
+tool's formulas (bytes = dim * 4 * rows) so numbers compare directly, followed
+by aggregated latency percentiles.
+
+Usage:
+  python concurrent_insert.py --entities 1 --inserts 100
+  python concurrent_insert.py --processes 16 --threads 4 --entities 100 --inserts 1000 --rate 200000 --csv insert_load.csv
+"""
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+from pymilvus import MilvusClient, Collection, connections
+
+from bench_common import MILVUS_URI, SharedRatePacer, percentiles, print_table, write_csv
+
+COLLECTION = "hello_milvus"
+
+
+def make_vectors(num_entities, dim):
+    """Same values as insert.go: vec[i][k] = (i * dim + k) / (num_entities * dim)."""
+    values = np.arange(num_entities * dim, dtype=np.float32) / np.float32(num_entities * dim)
+    return values.reshape(num_entities, dim)
+
+
+def worker(proc_idx, args, pacer, barrier, results):
+    vectors = make_vectors(args.entities, args.dim)
+    collections = []
+    try:
+        for t in range(args.threads):
+            alias = f"concurrent_insert_{proc_idx}_{t}"
+            connections.connect(alias, uri=args.uri)
+            collections.append(Collection(COLLECTION, using=alias))
+        barrier.wait()
+    except Exception as e:
+        # A failed worker breaks the barrier so nobody waits forever, and still reports.
+        print(f"process {proc_idx}: not started: {e!r}")
+        barrier.abort()
+        results.put(([], 0))
+        return
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def run(collection):
+        local_lat, local_err = [], 0
+        for _ in range(args.inserts):
+            pacer.acquire(args.entities)
+            t0 = time.perf_counter()
+            try:
+                collection.insert([vectors])
+            except Exception as e:
+                local_err += 1
+                if local_err == 1:
+                    print(f"process {proc_idx}: insert failed: {e}")
+                continue
+            local_lat.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local_lat)
+            errors.append(local_err)
+
+    threads = [threading.Thread(target=run, args=(c,)) for c in collections]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.put((latencies, sum(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--entities", type=int, default=1, help="rows per insert")
+    parser.add_argument("--inserts", type=int, default=100, help="inserts per worker thread")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=1, help="worker threads per process")
+    parser.add_argument("--rate", type=float, default=0, help="total rows/s across all workers, 0 = unpaced")
+    parser.add_argument("--csv", default=None, help="append the summary to this CSV file")
+    args = parser.parse_args()
+
+    client = MilvusClient(uri=args.uri)
+    client.drop_collection(COLLECTION)
+    client.create_collection(COLLECTION, args.dim, auto_id=True)
+
+    pacer = SharedRatePacer(args.rate)
+    barrier = multiprocessing.Barrier(args.processes + 1)
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=worker, args=(i, args, pacer, barrier, results))
+             for i in range(args.processes)]
+    for p in procs:
+        p.start()
+
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        print("some workers failed to start, timing is not meaningful")
+    start = time.perf_counter()
+    latencies, errors = [], 0
+    for _ in procs:
+        lat, err = results.get()
+        latencies.extend(lat)
+        errors += err
+    total_ms = (time.perf_counter() - start) * 1000
+    for p in procs:
+        p.join()
+
+    concurrency = args.processes * args.threads
+    rows = len(latencies) * args.entities
+    total_bytes = args.dim * 4 * rows
+    throughput = total_bytes / 1024 / 1024 / (total_ms / 1000)
+    qps = len(latencies) / (total_ms / 1000)
+    print(f"Total time: {total_ms:.2f} ms, Total bytes: {total_bytes}, Throughput: {throughput:.4f} MB/s, "
+          f"QPS: {qps:.4f}, concurrency: {concurrency}")
+
+    p = percentiles([v * 1000 for v in latencies])
+    summary = {"processes": args.processes, "threads": args.threads, "entities": args.entities,
+               "dim": args.dim, "rate": args.rate, "inserts": len(latencies), "errors": errors,
+               "rows_per_s": rows / (total_ms / 1000), "mb_per_s": throughput, "qps": qps,
+               "p50_ms": p["p50"], "p95_ms": p["p95"], "p99_ms": p["p99"],
+               "max_ms": max(latencies) * 1000 if latencies else float("nan")}
+    print_table([summary])
+    if args.csv:
+        write_csv(args.csv, [summary])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Client-side cost of an insert, by input form.
+
+simple_insert.py passes row dicts with NumPy vectors, other scripts pass Python
+lists; this profiler shows what each form costs before the server sees a byte.
+Every insert is split into three timed steps:
+  - build:  validation + InsertRequest construction in pymilvus
+            (row path: _prepare_row_insert_request; column path:
+            check_insert_schema + prepare_data + _prepare_batch_insert_request)
+  - encode: protobuf wire encoding (SerializeToString)
+  - send:   the Insert RPC with the pre-encoded bytes, i.e. network + server
+pymilvus validates and converts in the same pass, so one extra profiled build
+per form attributes build time to validation (functions named check*/valid*)
+vs conversion; that share is reported as validate_share.
+
+Input forms (same data, dim 1024 by default):
+  rows_list, rows_numpy:       [{"id", "vector", "a"}, ...] with list / ndarray vectors
+  columns_list, columns_numpy: [ids, vectors, a] as lists / NumPy arrays
+
+Usage:
+  python profile_insert_serialization.py
+  python profile_insert_serialization.py --dim 1024 --batch 2000 --requests 50 --csv serialization.csv
+"""
+
+import argparse
+import cProfile
+import pstats
+import re
+import time
+
+import numpy as np
+from pymilvus import MilvusClient, DataType, Collection, connections
+from pymilvus.orm.prepare import Prepare
+from pymilvus.client.utils import check_status
+from pymilvus.grpc_gen import milvus_pb2
+from pymilvus.orm.schema import check_insert_schema
+
+from bench_common import MILVUS_URI, percentiles, print_table, require_internals, write_csv
+
+COLLECTION = "profile_insert_serialization"
+ALIAS = "profile_insert_serialization"
+INSERT_METHOD = "/milvus.proto.milvus.MilvusService/Insert"
+FORMS = ("rows_list", "rows_numpy", "columns_list", "columns_numpy")
+VALIDATION_FUNCS = re.compile(r"check|valid", re.IGNORECASE)
+# The ORM column preparer; pymilvus renamed it between releases.
+_prepare_columns = getattr(Prepare, "prepare_data", None) or Prepare.prepare_insert_data
+
+
+def make_payload(form, ids, vectors, a):
+    if form == "rows_list":
+        return [{"id": i, "vector": v, "a": x} for i, v, x in zip(ids.tolist(), vectors.tolist(), a.tolist())]
+    if form == "rows_numpy":
+        return [{"id": i, "vector": v, "a": x} for i, v, x in zip(ids.tolist(), vectors, a.tolist())]
+    if form == "columns_list":
+        return [ids.tolist(), vectors.tolist(), a.tolist()]
+    return [ids, vectors, a]
+
+
+class InsertSteps:
+    def __init__(self, uri, collection):
+        self.collection = collection
+        self.client = MilvusClient(uri=uri)
+        require_internals(self.client, "_get_connection", purpose="profile_insert_serialization")
+        self.handler = self.client._get_connection()
+        require_internals(self.handler, "_final_channel", "_prepare_row_insert_request",
+                          "_prepare_batch_insert_request", purpose="profile_insert_serialization")
+        self.schema_dict = self.client.describe_collection(collection)
+        connections.connect(ALIAS, uri=uri)
+        self.orm_schema = Collection(collection, using=ALIAS).schema
+        # No request serializer: the stub takes bytes, so send excludes encoding. _final_channel
+        # is the one pymilvus' own stub uses, with the auth and db-name interceptors applied.
+        self.send_encoded = self.handler._final_channel.unary_unary(
+            INSERT_METHOD, response_deserializer=milvus_pb2.MutationResult.FromString)
+
+    def build(self, form, payload):
+        if form.startswith("rows"):
+            return self.handler._prepare_row_insert_request(self.collection, payload, schema=self.schema_dict)
+        check_insert_schema(self.orm_schema, payload)
+        entities = _prepare_columns(payload, self.orm_schema)
+        return self.handler._prepare_batch_insert_request(self.collection, entities, schema=self.schema_dict)
+
+    def insert(self, form, payload):
+        """Returns (build_s, encode_s, send_s, request_bytes)."""
+        t0 = time.perf_counter()
+        request = self.build(form, payload)
+        t1 = time.perf_counter()
+        encoded = request.SerializeToString()
+        t2 = time.perf_counter()
+        resp = self.send_encoded(encoded)
+        t3 = time.perf_counter()
+        check_status(resp.status)
+        return t1 - t0, t2 - t1, t3 - t2, len(encoded)
+
+    def validate_share(self, form, payload):
+        """Fraction of build time spent in pymilvus validation functions (profiled)."""
+        profiler = cProfile.Profile()
+        profiler.runcall(self.build, form, payload)
+        stats = pstats.Stats(profiler).stats
+        # tottime per function, so nested calls are not counted twice.
+        total = sum(s[2] for s in stats.values())
+        validate = sum(s[2] for (path, _, name), s in stats.items()
+                       if "pymilvus" in path and VALIDATION_FUNCS.search(name))
+        return validate / total if total else float("nan")
+
+
+def create_collection(client, dim):
+    client.drop_collection(COLLECTION)
+    schema = client.create_schema(auto_id=False, enable_dynamic_field=False)
+    schema.add_field("id", DataType.INT64, is_primary=True)
+    schema.add_field("vector", DataType.FLOAT_VECTOR, dim=dim)
+    schema.add_field("a", DataType.INT64)
+    client.create_collection(COLLECTION, schema=schema, consistency_level="Strong")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--batch", type=int, default=1500)
+    parser.add_argument("--requests", type=int, default=30, help="inserts per input form")
+    parser.add_argument("--forms", default=",".join(FORMS))
+    parser.add_argument("--csv", default=None, help="append results to this CSV file")
+    args = parser.parse_args()
+
+    client = MilvusClient(uri=args.uri)
+    create_collection(client, args.dim)
+    steps = InsertSteps(args.uri, COLLECTION)
+
+    rng = np.random.default_rng(seed=19530)
+    vectors = rng.random((args.batch, args.dim), dtype=np.float32)
+    results = []
+    for form in args.forms.split(","):
+        samples = []
+        for r in range(args.requests):
+            ids = np.arange(r * args.batch, (r + 1) * args.batch, dtype=np.int64)
+            payload = make_payload(form, ids, vectors, ids * 100)
+            samples.append(steps.insert(form, payload))
+        share = steps.validate_share(form, make_payload(form, ids, vectors, ids * 100))
+
+        build_ms, encode_ms, send_ms = ([s[k] * 1000 for s in samples] for k in range(3))
+        client_ms = [b + e for b, e in zip(build_ms, encode_ms)]
+        results.append({
+            "form": form,
+            "dim": args.dim,
+            "batch": args.batch,
+            "build_p50_ms": percentiles(build_ms)["p50"],
+            "encode_p50_ms": percentiles(encode_ms)["p50"],
+            "send_p50_ms": percentiles(send_ms)["p50"],
+            "client_p99_ms": percentiles(client_ms)["p99"],
+            "client_share": sum(client_ms) / (sum(client_ms) + sum(send_ms)),
+            "validate_share": share,
+            "request_mb": samples[0][3] / 1024 / 1024,
+        })
+        print(f"  {form}: build p50={results[-1]['build_p50_ms']:.1f}ms")
+
+    client.drop_collection(COLLECTION)
+    connections.disconnect(ALIAS)
+    print(f"\n========== CLIENT-SIDE INSERT COST (dim={args.dim}, batch={args.batch}) ==========")
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
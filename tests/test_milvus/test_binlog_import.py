@@ -4,9 +4,11 @@ Test binlog import to verify fix https://github.com/milvus-io/milvus/pull/47276
 
 import time
 import numpy as np
-import boto3
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
-from pymilvus.bulk_writer import bulk_import, get_import_progress
+from pymilvus.bulk_writer import bulk_import
+
+from bench_common import wait_for_import
+from binlog_index import build_index
 
 MILVUS_URI = "http://localhost:19530"
 DIM = 128
@@ -18,39 +20,11 @@ ROOT_PATH = "files"
 BUCKET = "a-bucket"
 
 
-def wait_for_import(job_id, timeout=120):
-    print(f"Waiting for import job {job_id}...")
-    start = time.time()
-    while time.time() - start < timeout:
-        resp = get_import_progress(url=MILVUS_URI, job_id=job_id)
-        data = resp.json().get("data", {})
-        state = data.get("state", "Unknown")
-        progress = data.get("progress", 0)
-        print(f"  state={state}, progress={progress}")
-        if state == "Completed":
-            return True
-        if state == "Failed":
-            print(f"  FAILED: {data.get('reason', 'unknown')}")
-            return False
-        time.sleep(3)
-    print("  Timed out")
-    return False
-
-
 def list_delta_segments(collection_id):
-    """List L0 segment dirs from minio."""
-    s3 = boto3.client(
-        "s3", endpoint_url="http://localhost:9000",
-        aws_access_key_id="minioadmin", aws_secret_access_key="minioadmin",
-    )
-    prefix = f"{ROOT_PATH}/delta_log/{collection_id}/"
-    resp = s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix, Delimiter="/")
-    delta_files = []
-    for part_dir in [cp["Prefix"] for cp in resp.get("CommonPrefixes", [])]:
-        resp2 = s3.list_objects_v2(Bucket=BUCKET, Prefix=part_dir, Delimiter="/")
-        for seg_dir in [cp["Prefix"] for cp in resp2.get("CommonPrefixes", [])]:
-            delta_files.append([seg_dir.rstrip("/")])
-    return delta_files
+    """List L0 segment dirs from minio (all partitions, paginated, in parallel)."""
+    index = build_index(collection_id, log_types=("delta_log",), with_files=False,
+                        root_path=ROOT_PATH, bucket=BUCKET)
+    return index.import_files("delta_log")
 
 
 def main():
@@ -119,7 +93,8 @@ def main():
     resp = bulk_import(url=MILVUS_URI, collection_name=TARGET_COLLECTION, files=insert_files,
                        partition_name="_default", options={"backup": "true", "storage_version": "2"})
     job_id = resp.json()["data"]["jobId"]
-    assert wait_for_import(job_id), "L1 import failed"
+    print(f"Waiting for import job {job_id}...")
+    wait_for_import(job_id, uri=MILVUS_URI, timeout=120, poll_interval=3, verbose=True)
 
     # === L0 import ===
     print("\n--- L0 import ---")
@@ -129,7 +104,8 @@ def main():
         resp = bulk_import(url=MILVUS_URI, collection_name=TARGET_COLLECTION, files=delta_files,
                            options={"l0_import": "true", "storage_version": "2"})
         job_id = resp.json()["data"]["jobId"]
-        assert wait_for_import(job_id), "L0 import failed"
+        print(f"Waiting for import job {job_id}...")
+        wait_for_import(job_id, uri=MILVUS_URI, timeout=120, poll_interval=3, verbose=True)
     else:
         print("No delta logs found")
 
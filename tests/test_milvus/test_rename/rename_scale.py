@@ -0,0 +1,225 @@
+"""
+Rename / database move at scale, extending init.py and rename.py.
+
+Creates --collections collections in the default database plus --dbs target
+databases, then runs --rounds rounds in which every collection is renamed
+and moved to the next database (default -> db_0 -> db_1 -> ... -> default),
+with --concurrency renames in flight. Meanwhile --traffic threads keep
+inserting into and searching random collections at their current location.
+
+Reports rename latency percentiles and, for the traffic, latency, max stall
+and client-visible errors, split by whether the target collection was being
+renamed at that moment.
+
+Usage:
+  python rename_scale.py --collections 200 --dbs 2 --rounds 2 --concurrency 16 --traffic 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pymilvus import MilvusClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_common import MILVUS_URI, percentiles, print_table  # noqa: E402
+
+dim = 8
+DEFAULT_DB = "default"
+db_prefix = "rename_scale_db"
+collection_prefix = "rename_scale"
+
+
+class Locations:
+    """Current (db, name) of every collection and which ones are mid-rename."""
+
+    def __init__(self, names):
+        self._lock = threading.Lock()
+        self.current = {i: (DEFAULT_DB, name) for i, name in enumerate(names)}
+        self.renaming = set()
+
+    def get(self, i):
+        with self._lock:
+            return self.current[i], i in self.renaming
+
+    def begin(self, i):
+        with self._lock:
+            self.renaming.add(i)
+            return self.current[i]
+
+    def end(self, i, location=None):
+        with self._lock:
+            self.renaming.discard(i)
+            if location:
+                self.current[i] = location
+
+    def is_renaming(self, i):
+        with self._lock:
+            return i in self.renaming
+
+
+class Clients:
+    """One MilvusClient per database per thread; MilvusClient is bound to its db."""
+
+    def __init__(self, uri):
+        self.uri = uri
+        self._local = threading.local()
+
+    def get(self, db):
+        cache = self._local.__dict__.setdefault("clients", {})
+        if db not in cache:
+            cache[db] = MilvusClient(uri=self.uri, db_name=db)
+        return cache[db]
+
+
+def setup(client, uri, num_collections, num_dbs, concurrency):
+    dbs = [f"{db_prefix}_{k}" for k in range(num_dbs)]
+    for db in dbs:
+        if db not in client.list_databases():
+            client.create_database(db)
+    names = [f"{collection_prefix}_{i}" for i in range(num_collections)]
+    clients = Clients(uri)
+    rng = np.random.default_rng(seed=19530)
+    rows = [{"id": j, "vector": v} for j, v in enumerate(rng.random((100, dim), dtype=np.float32))]
+
+    def create(name):
+        c = clients.get(DEFAULT_DB)
+        c.drop_collection(name)
+        c.create_collection(name, dim, consistency_level="Strong", metric_type="L2")
+        c.insert(name, rows)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(create, names))
+    print(f"Created {len(names)} collections and {len(dbs)} databases")
+    return dbs, names
+
+
+def traffic(clients, locations, stop, records, seed):
+    rng = random.Random(seed)
+    vec_rng = np.random.default_rng(seed)
+    while not stop.is_set():
+        i = rng.randrange(len(locations.current))
+        (db, name), renaming = locations.get(i)
+        kind = rng.choice(("insert", "search"))
+        vectors = vec_rng.random((10, dim), dtype=np.float32)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            c = clients.get(db)
+            if kind == "insert":
+                ids = vec_rng.integers(0, 1 << 40, len(vectors)).tolist()
+                c.insert(name, [{"id": j, "vector": v} for j, v in zip(ids, vectors)])
+            else:
+                c.search(name, vectors[:1].tolist(), limit=10)
+        except Exception as e:
+            error = str(e)
+        elapsed = time.perf_counter() - t0
+        records.append((kind, elapsed, error, renaming or locations.is_renaming(i)))
+
+
+def rename_all(clients, locations, dbs, round_no, concurrency):
+    """Move every collection one database along the ring. Returns rename latencies and errors."""
+    ring = [DEFAULT_DB] + dbs
+    latencies, errors = [], []
+
+    def rename(i):
+        db, name = locations.begin(i)
+        target_db = ring[(ring.index(db) + 1) % len(ring)]
+        new_name = f"{collection_prefix}_{i}_r{round_no}"
+        t0 = time.perf_counter()
+        try:
+            clients.get(db).rename_collection(old_name=name, new_name=new_name, target_db=target_db)
+        except Exception as e:
+            locations.end(i)
+            errors.append(f"{db}.{name}: {e}")
+            return
+        latencies.append(time.perf_counter() - t0)
+        locations.end(i, (target_db, new_name))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(rename, list(locations.current)))
+    return latencies, errors
+
+
+def traffic_report(records):
+    rows = []
+    for kind in ("insert", "search"):
+        for during in (False, True):
+            group = [r for r in records if r[0] == kind and r[3] == during]
+            ms = [r[1] * 1000 for r in group]
+            p = percentiles(ms)
+            rows.append({"op": kind, "during_rename": during, "ops": len(group),
+                         "errors": sum(1 for r in group if r[2]), "p50_ms": p["p50"], "p99_ms": p["p99"],
+                         "max_stall_ms": max(ms) if ms else float("nan")})
+    return rows
+
+
+def cleanup(clients, locations, dbs):
+    for db, name in locations.current.values():
+        clients.get(db).drop_collection(name)
+    client = clients.get(DEFAULT_DB)
+    for db in dbs:
+        client.drop_database(db)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=MILVUS_URI)
+    parser.add_argument("--collections", type=int, default=200)
+    parser.add_argument("--dbs", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16, help="renames in flight")
+    parser.add_argument("--traffic", type=int, default=4, help="insert/search threads")
+    parser.add_argument("--keep", action="store_true", help="keep collections and databases")
+    args = parser.parse_args()
+
+    clients = Clients(args.uri)
+    dbs, names = setup(clients.get(DEFAULT_DB), args.uri, args.collections, args.dbs, args.concurrency)
+    locations = Locations(names)
+
+    stop = threading.Event()
+    records = []
+    threads = [threading.Thread(target=traffic, args=(clients, locations, stop, records, t), daemon=True)
+               for t in range(args.traffic)]
+    for t in threads:
+        t.start()
+    time.sleep(2)  # traffic baseline before the first rename
+
+    rename_rows, all_errors = [], []
+    for round_no in range(args.rounds):
+        start = time.perf_counter()
+        latencies, errors = rename_all(clients, locations, dbs, round_no, args.concurrency)
+        elapsed = time.perf_counter() - start
+        p = percentiles([v * 1000 for v in latencies])
+        rename_rows.append({"round": round_no, "renamed": len(latencies), "errors": len(errors),
+                            "seconds": elapsed, "p50_ms": p["p50"], "p95_ms": p["p95"], "p99_ms": p["p99"],
+                            "max_ms": max(latencies) * 1000 if latencies else float("nan")})
+        all_errors.extend(errors)
+
+    time.sleep(2)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print("\n========== RENAME LATENCY ==========")
+    print_table(rename_rows)
+    for e in all_errors[:10]:
+        print(f"  {e}")
+    print("\n========== TRAFFIC DURING RENAMES ==========")
+    print_table(traffic_report(records))
+    kinds = Counter(r[2].splitlines()[0][:100] for r in records if r[2])
+    for message, count in kinds.most_common(10):
+        print(f"  {count:>6}  {message}")
+
+    if not args.keep:
+        cleanup(clients, locations, dbs)
+
+
+if __name__ == "__main__":
+    main()